@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare the original build_command with the FrameEncoder.
+
+Usage:
+    python3 benchmarks/bench_build_command.py [--number N]
+"""
+
+import argparse
+import logging
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.append(str(Path(__file__).parent.parent / "custom_components" / "lg_tv_serial"))
+from lgtv_api import FrameEncoder, RemoteKeyCode, build_command  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def build_command_original(
+    command1,
+    command2,
+    set_id: int,
+    data0: int,
+    data1: int | None = None,
+    data2: int | None = None,
+    data3: int | None = None,
+    data4: int | None = None,
+    data5: int | None = None,
+) -> bytes:
+    """build_command as it was before the FrameEncoder"""
+    arguments = locals()
+
+    command_string = f"{command1}{command2} {set_id:02X}"
+    data_index = 0
+    while arguments[f"data{data_index}"] is not None:
+        data = arguments[f"data{data_index}"]
+        command_string += f" {data:02X}"
+        data_index += 1
+    command_string += "\r"  # CR
+    logger.debug("build_command string: %s" % command_string)
+
+    command = command_string.encode("ascii")
+    logger.debug("build_command bytes: %r" % command)
+
+    return command
+
+
+CASES = {
+    "query": ("k", "a", 0xFF),
+    "remote key": ("m", "c", RemoteKeyCode.VOLUME_PLUS),
+    "set volume": ("k", "f", 0x20),
+    "set 3d": ("x", "t", 0x00, 0x01, 0x00, 0x10),
+}
+
+
+def main(number: int) -> None:
+    encoder = FrameEncoder(1)
+    implementations = {
+        "original": lambda *args: build_command_original(args[0], args[1], 1, *args[2:]),
+        "build_command": lambda *args: build_command(args[0], args[1], 1, *args[2:]),
+        "FrameEncoder": encoder.encode,
+    }
+
+    for case, args in CASES.items():
+        expected = build_command_original(args[0], args[1], 1, *args[2:])
+        print(f"--- {case}: {expected!r}")
+        for name, implementation in implementations.items():
+            assert implementation(*args) == expected
+            seconds = timeit.timeit(lambda: implementation(*args), number=number)
+            print(f"{name:<14} {seconds / number * 1e9:8.0f} ns/frame")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+    main(args.number)
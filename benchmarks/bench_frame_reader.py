@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare reading responses byte by byte with the buffered FrameDecoder.
+
+Usage:
+    python3 benchmarks/bench_frame_reader.py [--responses N]
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(str(Path(__file__).parent.parent / "custom_components" / "lg_tv_serial"))
+from lgtv_api import END_MARKER, READ_CHUNK_SIZE, FrameDecoder  # noqa: E402
+
+# Typical response, some TVs send 0xFF junk before the actual response
+RESPONSE = b"\xff\xffa 01 OK01x"
+
+
+class CountingReader(asyncio.StreamReader):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        self.reads += 1
+        return await super().read(n)
+
+
+async def read_bytewise(reader: asyncio.StreamReader) -> bytes:
+    """The loop as it was in LgTv._do_command"""
+    response = bytearray()
+    while True:
+        data = await reader.read(1)
+        if data == b"":
+            raise ConnectionError("No data, connection lost")
+        elif data == b" " or data.isalnum():
+            if data == END_MARKER:
+                return bytes(response)
+            response.extend(data)
+
+
+async def read_buffered(reader: asyncio.StreamReader, decoder: FrameDecoder) -> bytes:
+    while (frame := decoder.next_frame()) is None:
+        data = await reader.read(READ_CHUNK_SIZE)
+        if data == b"":
+            raise ConnectionError("No data, connection lost")
+        decoder.feed(data)
+    return frame
+
+
+async def run(name: str, responses: int, buffered: bool) -> None:
+    reader = CountingReader()
+    decoder = FrameDecoder()
+
+    start = time.process_time()
+    for _ in range(responses):
+        # Each response arrives on its own, like it would after sending a command
+        reader.feed_data(RESPONSE)
+        if buffered:
+            frame = await read_buffered(reader, decoder)
+        else:
+            frame = await read_bytewise(reader)
+        assert frame == b"a 01 OK01"
+    cpu = time.process_time() - start
+
+    print(
+        f"{name:<10} reads/response: {reader.reads / responses:5.1f}  "
+        f"cpu/response: {cpu / responses * 1e6:7.2f} us"
+    )
+
+
+async def main(responses: int) -> None:
+    await run("bytewise", responses, buffered=False)
+    await run("buffered", responses, buffered=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--responses", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.responses))
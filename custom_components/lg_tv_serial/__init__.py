@@ -2,29 +2,39 @@
 
 from __future__ import annotations
 
-from homeassistant.config_entries import ConfigEntry, OperationNotAllowed
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback, ServiceCall
-from homeassistant.exceptions import ConfigEntryNotReady, ServiceValidationError
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.service import async_extract_config_entry_ids
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 
 
 from .const import (
     ATTR_COMMAND_1,
     ATTR_COMMAND_2,
     ATTR_CONFIG_ENTRY,
+    ATTR_CONFIRM,
     ATTR_DATA_0,
     ATTR_DATA_1,
     ATTR_DATA_2,
     ATTR_DATA_3,
     ATTR_DATA_4,
     ATTR_DATA_5,
+    ATTR_ENABLED,
+    ATTR_INPUT,
+    ATTR_MAX_BYTES,
+    ATTR_POWER,
     DOMAIN,
     LOGGER,
+    SERVICE_CAPTURE,
+    SERVICE_GROUP_COMMAND,
     SERVICE_SEND_RAW,
 )
 from .coordinator import LgTvCoordinator
-from .lgtv_api import LgTv
+from .helpers import async_take_api, create_api
+from .lgtv_api import CAPTURE_MAX_BYTES, Input, TvGroup
 from homeassistant.helpers import config_validation as cv
 import voluptuous as vol  # type: ignore[import]
 
@@ -33,10 +43,13 @@ PLATFORMS: list[Platform] = [
     Platform.REMOTE,
     Platform.SWITCH,
     Platform.SELECT,
+    Platform.SENSOR,
 ]
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+INPUT_OPTIONS = {slugify(i.name): i for i in Input if i is not Input.UNKNOWN}
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
     async def async_send_raw(call: ServiceCall):
@@ -99,6 +112,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             config_entry.entry_id
         ]
         await coordinator.api.send_raw(command1, command2, data)
+        coordinator.mark_active()
 
     hass.services.async_register(
         DOMAIN,
@@ -119,6 +133,115 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         )
     )
 
+    async def async_group_command(call: ServiceCall) -> ServiceResponse:
+        """
+        Send the same command to all targeted TVs at once
+        """
+        power = call.data.get(ATTR_POWER)
+        input_ = call.data.get(ATTR_INPUT)
+        if power is None and input_ is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="no_group_command",
+            )
+
+        coordinators: dict[str, LgTvCoordinator] = {
+            entry_id: hass.data[DOMAIN][entry_id]
+            for entry_id in await async_extract_config_entry_ids(hass, call)
+            if entry_id in hass.data.get(DOMAIN, {})
+        }
+        if not coordinators:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="no_tvs_targeted",
+            )
+
+        group = TvGroup(coordinator.api for coordinator in coordinators.values())
+        confirm = call.data[ATTR_CONFIRM]
+        results = []
+        try:
+            if power is not None:
+                results.append(await group.set_power_on(power, confirm=confirm))
+            if input_ is not None:
+                results.append(await group.set_input(INPUT_OPTIONS[input_], confirm=confirm))
+        except ConnectionError as e:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="connection_error",
+            ) from e
+
+        for coordinator in coordinators.values():
+            coordinator.mark_active()
+            await coordinator.async_request_refresh()
+
+        if not confirm:
+            return None
+        return {
+            "confirmed": {
+                entry_id: all(result.get(coordinator.api) is not None for result in results)
+                for entry_id, coordinator in coordinators.items()
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GROUP_COMMAND,
+        async_group_command,
+        schema=cv.make_entity_service_schema(
+            {
+                vol.Optional(ATTR_POWER): cv.boolean,
+                vol.Optional(ATTR_INPUT): vol.In(list(INPUT_OPTIONS)),
+                vol.Optional(ATTR_CONFIRM, default=True): cv.boolean,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_capture(call: ServiceCall) -> ServiceResponse:
+        """
+        Start or stop capturing the traffic on the serial connection of the TV.
+
+        Stopping returns what was captured, it is also in the diagnostics while capturing.
+        """
+        config_entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY])
+        if config_entry is None or config_entry.entry_id not in hass.data.get(DOMAIN, {}):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="config_entry_not_found",
+                translation_placeholders={"config_entry": call.data[ATTR_CONFIG_ENTRY]},
+            )
+        coordinator: LgTvCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+        try:
+            if call.data[ATTR_ENABLED]:
+                coordinator.api.start_capture(call.data[ATTR_MAX_BYTES])
+                return None
+        except ConnectionError as e:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="connection_error",
+            ) from e
+
+        if (capture := coordinator.api.stop_capture()) is None:
+            return {"records": []}
+        return {"records": [record.to_json() for record in capture.records]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE,
+        async_capture,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_CONFIG_ENTRY): cv.string,
+                vol.Required(ATTR_ENABLED): cv.boolean,
+                vol.Optional(ATTR_MAX_BYTES, default=CAPTURE_MAX_BYTES): vol.All(
+                    vol.Coerce(int), vol.Range(min=1024)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     return True
 
 
@@ -128,28 +251,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
 
-    api = LgTv(
-        entry.data["serial_url"],
-        entry.data.get("set_id", 0),
-        entry.data.get("rtscts", False),
-        entry.data.get("dsrdtr", False),
-    )
+    # Reuse the connection the config flow just validated
+    api = async_take_api(hass, entry.data["serial_url"], entry.data.get("set_id", 0)) or create_api(entry.data)
 
-    @callback
     async def on_disconnect():
-        LOGGER.info("Disconnected, attempt to reload integration")
-        # Reload the entry on disconnect.
-        # HA will take care of re-init and retries
-        try:
-            # Call reload in a task, otherwise it seems to lock up
-            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
-        except OperationNotAllowed:  # pragma: no cover
-            # Can not reload when during setup
-            # Which is fine, so just let it go
-            LOGGER.debug("Operation not allowed", exc_info=True)
+        LOGGER.info("Disconnected, reconnecting")
+        if coordinator := hass.data[DOMAIN].get(entry.entry_id):
+            # Notice quickly when the grace period is over
+            coordinator.mark_active()
+
+    async def on_reconnect():
+        LOGGER.info("Reconnected")
+        if coordinator := hass.data[DOMAIN].get(entry.entry_id):
+            await coordinator.async_request_refresh()
 
     try:
-        await api.connect(on_disconnect)
+        # The API reconnects by itself, the coordinator keeps the entities available for a while
+        await api.connect(on_disconnect, on_reconnect, reconnect=True)
 
         coordinator = LgTvCoordinator(hass, entry, api)
         await coordinator.async_config_entry_first_refresh()
@@ -159,7 +277,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         return True
     except ConnectionError as e:
+        await api.close()
         raise ConfigEntryNotReady(f"Could not connect to LG TV: {entry.title}") from e
+    except ConfigEntryNotReady:
+        # Do not keep reconnecting, HA retries the setup
+        await api.close()
+        raise
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -8,16 +8,31 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant.config_entries import (
+    ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
+    OptionsFlow,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
 
 
-from .const import DOMAIN, SERIAL_URL, SET_ID, RTSCTS, DSRDTR
-from .lgtv_api import LgTv
+from .const import (
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_POLL_PERIOD,
+    DOMAIN,
+    MAX_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    POLL_PERIOD_OPTIONS,
+    SERIAL_URL,
+    SET_ID,
+    RTSCTS,
+    DSRDTR,
+)
+from .helpers import async_hand_off_api, create_api
+from .lgtv_api import PowerState
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,21 +60,66 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+def _number(minimum: int, maximum: int, unit: str | None = None) -> vol.All:
+    return vol.All(
+        selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=minimum,
+                max=maximum,
+                mode=selector.NumberSelectorMode.BOX,
+                unit_of_measurement=unit,
+            ),
+        ),
+        vol.Coerce(int),
+    )
+
+
+def _options_schema(options: dict[str, Any]) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(
+                MIN_UPDATE_INTERVAL,
+                default=options.get(MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL),
+            ): _number(1, 300, "s"),
+            vol.Required(
+                MAX_UPDATE_INTERVAL,
+                default=options.get(MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+            ): _number(1, 300, "s"),
+            **{
+                vol.Required(
+                    POLL_PERIOD_OPTIONS[field], default=options.get(POLL_PERIOD_OPTIONS[field], default)
+                ): _number(0, 3600, "s")
+                for field, default in DEFAULT_POLL_PERIOD.items()
+            },
+        }
+    )
+
+
+async def validate_input(
+    hass: HomeAssistant, data: dict[str, Any], hand_off: bool = True
+) -> dict[str, Any]:
     """Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
+    With `hand_off` the working connection is kept for setting up the entry,
+    otherwise it gets closed.
     """
+    api = create_api(data)
     try:
-        async with LgTv(
-            data[SERIAL_URL], data[SET_ID], data[RTSCTS], data[DSRDTR]
-        ) as api:
-            await api.connect()
-            if await api.get_power_on() is None:
-                raise CannotConnect("No response from LG TV")
+        await api.connect()
     except ConnectionError as e:
         raise CannotConnect("Could not connect to LG TV, check port settings") from e
 
+    # Connecting already read the power state
+    if api.power_state is PowerState.UNKNOWN:
+        await api.close()
+        raise CannotConnect("No response from LG TV")
+
+    if hand_off:
+        async_hand_off_api(hass, data[SERIAL_URL], data[SET_ID], api)
+    else:
+        await api.close()
+
     return {"title": "LG TV"}
 
 
@@ -68,6 +128,12 @@ class LgTvConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> LgTvOptionsFlow:
+        """Get the options flow for this handler."""
+        return LgTvOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -100,7 +166,9 @@ class LgTvConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         if user_input is not None:
             try:
-                await validate_input(self.hass, user_input)
+                # The entry still has the bus open with the old settings,
+                # reloading has to open it again with the new ones
+                await validate_input(self.hass, user_input, hand_off=False)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -125,6 +193,27 @@ class LgTvConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class LgTvOptionsFlow(OptionsFlow):
+    """Handle options for LG TV Serial."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the polling schedule."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if user_input[MIN_UPDATE_INTERVAL] > user_input[MAX_UPDATE_INTERVAL]:
+                errors["base"] = "invalid_interval_bounds"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=_options_schema(user_input or dict(self.config_entry.options)),
+            errors=errors,
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -14,6 +14,8 @@ DSRDTR = "dsrdtr"
 ATTR_COMMANDS = "commands"
 
 SERVICE_SEND_RAW = "send_raw"
+SERVICE_GROUP_COMMAND = "group_command"
+SERVICE_CAPTURE = "capture"
 
 ATTR_CONFIG_ENTRY = "config_entry"
 ATTR_COMMAND_1 = "command1"
@@ -24,8 +26,44 @@ ATTR_DATA_2 = "data2"
 ATTR_DATA_3 = "data3"
 ATTR_DATA_4 = "data4"
 ATTR_DATA_5 = "data5"
+ATTR_POWER = "power"
+ATTR_INPUT = "input"
+ATTR_CONFIRM = "confirm"
+ATTR_ENABLED = "enabled"
+ATTR_MAX_BYTES = "max_bytes"
 
 
 DEFAULT_DEVICE_NAME = "LG TV"
 
-COORDINATOR_UPDATE_INTERVAL = 10
\ No newline at end of file
+COORDINATOR_UPDATE_INTERVAL = 10
+# Bounds in seconds for the adaptive update interval, configurable in the options
+MIN_UPDATE_INTERVAL = "min_update_interval"
+MAX_UPDATE_INTERVAL = "max_update_interval"
+DEFAULT_MIN_UPDATE_INTERVAL = 2
+DEFAULT_MAX_UPDATE_INTERVAL = 30
+# Seconds to update at the minimum interval after a command or a detected change
+FAST_UPDATE_DURATION = 20
+# Default seconds between reading a field, configurable in the options. 0 reads it every update
+DEFAULT_POLL_PERIOD = {
+    "power_on": 0,
+    "volume": 0,
+    "mute": 0,
+    "input": 30,
+    "remote_control_lock": 60,
+    "energy_saving": 60,
+}
+POLL_PERIOD_OPTIONS = {field: f"poll_period_{field}" for field in DEFAULT_POLL_PERIOD}
+# Seconds an update can be early and still read the fields that are due around then
+POLL_PERIOD_TOLERANCE = 1.0
+# Seconds values read or confirmed by the TV are recent enough to skip reading them again
+CACHE_MAX_AGE = 1.0
+# Seconds a value reported by the TV is trusted to skip writing the same value
+REDUNDANT_WRITE_MAX_AGE = COORDINATOR_UPDATE_INTERVAL
+# Seconds the connection and readings from the config flow are kept for setting up the entry
+HANDOFF_TIMEOUT = 30
+HANDOFF = f"{DOMAIN}_handoff"
+# Seconds entities stay available with their last known state while reconnecting
+RECONNECT_GRACE_PERIOD = 30
+# Amount of commands that can be sent to the TV before its responses are received.
+# Pipelining was only tried with the emulator, so real hardware gets one command at a time.
+COMMAND_WINDOW = 1
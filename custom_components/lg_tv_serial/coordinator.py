@@ -1,17 +1,39 @@
 """Coordinator for the LG TV integration."""
 
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, fields as dataclass_fields, replace
+import asyncio
 import datetime
+import time
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed
 )
 
-from .const import COORDINATOR_UPDATE_INTERVAL, DOMAIN, LOGGER
-from .lgtv_api import EnergySaving, LgTv, Input
+from .const import (
+    CACHE_MAX_AGE,
+    COORDINATOR_UPDATE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_POLL_PERIOD,
+    DOMAIN,
+    FAST_UPDATE_DURATION,
+    HANDOFF_TIMEOUT,
+    LOGGER,
+    MAX_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    POLL_PERIOD_OPTIONS,
+    POLL_PERIOD_TOLERANCE,
+    RECONNECT_GRACE_PERIOD,
+)
+from .lgtv_api import EnergySaving, LgTv, Input, PowerState
+
+# Fields that can only be read when the TV is on
+STATUS_FIELDS = ["mute", "volume", "input", "remote_control_lock", "energy_saving"]
 
 @dataclass
 class CoordinatorData:
@@ -43,33 +65,185 @@ class LgTvCoordinator(DataUpdateCoordinator[CoordinatorData]):
         self.api = api
         self.data:CoordinatorData = CoordinatorData()
         self.config_entry = entry
+        self._update_count = 0
+        self._last_read: dict[str, float] = {}
+        """Monotonic time each field was last read"""
+        self._fast_until = 0.0
+        self._subscriptions: dict[str, int] = {}
+        self._unread_fields: set[str] = set()
+        self.changed_fields: set[str] = set()
+        """Fields of CoordinatorData that changed with the last update"""
+        self._notified_success: bool | None = None
+        self._refresh_when_ready: asyncio.Task | None = None
+
+    @property
+    def subscribed_fields(self) -> set[str]:
+        return set(self._subscriptions)
+
+    @callback
+    def async_subscribe_fields(self, fields: Iterable[str]) -> CALLBACK_TYPE:
+        """
+        Poll the fields for as long as the subscription lasts, returns a callback to unsubscribe.
+
+        Status fields are only polled while an (enabled) entity uses them. Power is always polled.
+        """
+        fields = tuple(fields)
+        new_fields = set(fields) - self._subscriptions.keys()
+        for field in fields:
+            self._subscriptions[field] = self._subscriptions.get(field, 0) + 1
+
+        if new_fields:
+            # Do not wait for the polling schedule to show the new fields
+            self._unread_fields |= new_fields
+            self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def unsubscribe() -> None:
+            for field in fields:
+                self._subscriptions[field] -= 1
+                if self._subscriptions[field] == 0:
+                    del self._subscriptions[field]
+
+        return unsubscribe
+
+    @property
+    def min_interval(self) -> datetime.timedelta:
+        return datetime.timedelta(
+            seconds=self.config_entry.options.get(MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL)
+        )
+
+    @property
+    def max_interval(self) -> datetime.timedelta:
+        return datetime.timedelta(
+            seconds=self.config_entry.options.get(MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)
+        )
+
+    @callback
+    def async_set_updated_data(self, data: CoordinatorData) -> None:
+        # Optimistic updates change the data in place, so there is nothing to compare with
+        self.changed_fields = {field.name for field in dataclass_fields(CoordinatorData)}
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Only wake up the listeners when something changed, `changed_fields` tells what."""
+        if (
+            self.changed_fields
+            or self.last_update_success != self._notified_success
+        ):
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+
+    @callback
+    def mark_active(self) -> None:
+        """Update fast for a while, e.g. after sending a command to the TV."""
+        self._fast_until = time.monotonic() + FAST_UPDATE_DURATION
+        self.update_interval = self.min_interval
+
+    def _next_interval(self) -> datetime.timedelta:
+        """
+        Update fast while things are happening and back off when nothing changes.
+
+        A TV that is off only gets its power state read, so that can be done at the slowest rate.
+        """
+        if time.monotonic() < self._fast_until:
+            return self.min_interval
+        if not self.data.power_on:
+            return self.max_interval
+        assert self.update_interval is not None
+        return max(self.min_interval, min(self.update_interval * 2, self.max_interval))
+
+    def _fields_due(self, now: float) -> set[str]:
+        """
+        Fields to read this update according to the polling schedule in the options.
+
+        The schedule is in seconds because the update interval varies.
+        """
+        return {
+            field
+            for field, default in DEFAULT_POLL_PERIOD.items()
+            if field not in self._last_read
+            or now - self._last_read[field] + POLL_PERIOD_TOLERANCE
+            >= self.config_entry.options.get(POLL_PERIOD_OPTIONS[field], default)
+        }
+
+    def _reconnecting(self) -> bool:
+        """Connection got lost less than the grace period ago, it is probably back soon."""
+        disconnected_at = self.api.connection_stats.disconnected_at
+        return (
+            disconnected_at is not None
+            and asyncio.get_running_loop().time() - disconnected_at < RECONNECT_GRACE_PERIOD
+        )
+
+    async def _async_refresh_when_ready(self) -> None:
+        await self.api.wait_until_ready()
+        await self.async_refresh()
 
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
         # Note: asyncio.TimeoutError and aiohttp.ClientError are already
         # handled by the data update coordinator.
+        self.changed_fields = set()
+        if self.api.power_state is PowerState.BOOTING:
+            # The TV does not respond while booting, refresh everything as soon as it does
+            if self._refresh_when_ready is None or self._refresh_when_ready.done():
+                self._refresh_when_ready = self.config_entry.async_create_background_task(
+                    self.hass, self._async_refresh_when_ready(), "lg_tv_serial refresh when ready"
+                )
+            return self.data
+
+        now = time.monotonic()
+        due = self._fields_due(now) | self._unread_fields
+        self._unread_fields.clear()
+        self._update_count += 1
+        previous = replace(self.data)
         try:
-            self.data.power_on = await self.api.get_power_on()
+            # Power changed from Home Assistant is not confirmed yet
+            was_on = self.data.power_on if self.data.power_synced else None
+            if "power_on" in due or was_on is None:
+                self.data.power_on = await self.api.get_power_on(
+                    # The first update can use what the config flow read
+                    max_age=CACHE_MAX_AGE if self._update_count > 1 else HANDOFF_TIMEOUT
+                )
+                self._last_read["power_on"] = now
             if self.data.power_on:
-                self.data.mute = await self.api.get_mute()
-                self.data.volume = await self.api.get_volume()
-                self.data.input = await self.api.get_input()
-                self.data.remote_control_lock = await self.api.get_remote_control_lock()
-                self.data.energy_saving = await self.api.get_energy_saving()
+                # Nothing is known yet about a TV that just turned on
+                fields = [
+                    field
+                    for field in STATUS_FIELDS
+                    if field in self._subscriptions and (not was_on or field in due)
+                ]
+                if fields:
+                    snapshot = await self.api.snapshot(fields, max_age=CACHE_MAX_AGE)
+                    for field in fields:
+                        setattr(self.data, field, snapshot.value(field))
+                        self._last_read[field] = now
             else:
-                self.data.mute = None
-                self.data.volume = None
-                self.data.input = None
-                self.data.remote_control_lock = None
-                self.data.energy_saving = None
+                for field in STATUS_FIELDS:
+                    setattr(self.data, field, None)
             self.data.power_synced = True
         except ConnectionError as error:
-            raise UpdateFailed(
-                translation_domain=DOMAIN,
-                translation_key="connection_error"
-            ) from error
+            if not self._reconnecting():
+                raise UpdateFailed(
+                    translation_domain=DOMAIN,
+                    translation_key="connection_error"
+                ) from error
+            LOGGER.debug("Not connected, keeping the last known state while reconnecting")
 
         LOGGER.debug(self.data)
 
+        self.changed_fields = {
+            field.name
+            for field in dataclass_fields(CoordinatorData)
+            if getattr(self.data, field.name) != getattr(previous, field.name)
+        }
+        if self.changed_fields:
+            LOGGER.debug("Changed fields: %s", self.changed_fields)
+
+        # Includes power changes from Home Assistant while the TV is booting
+        if previous.power_synced is not None and (self.changed_fields or not previous.power_synced):
+            self.mark_active()
+        self.update_interval = self._next_interval()
+
         return self.data
 
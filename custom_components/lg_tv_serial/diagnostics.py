@@ -0,0 +1,50 @@
+"""Diagnostics support for LG TV Serial."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import LgTvCoordinator
+from .lgtv_api import LATENCY_BUCKETS
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: LgTvCoordinator = hass.data[DOMAIN][entry.entry_id]
+    stats = coordinator.api.stats()
+    capture = coordinator.api.capture
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "data": asdict(coordinator.data),
+        "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+        "power_state": coordinator.api.power_state.value,
+        "stats": {
+            "latency_buckets": LATENCY_BUCKETS,
+            "commands": {
+                f"{command1}{command2}": {**asdict(command_stats), "average_latency": command_stats.average_latency}
+                for (command1, command2), command_stats in sorted(stats.commands.items())
+            },
+            "connection": asdict(stats.connection),
+            "counters": asdict(stats.counters),
+            "queue_wait": {priority.name.lower(): asdict(wait) for priority, wait in stats.queue_wait.items()},
+            "junk_bytes": stats.junk_bytes,
+        },
+        "capture": {
+            "max_bytes": capture.max_bytes,
+            "dropped": capture.dropped,
+            "records": [record.to_json() for record in capture.records],
+        }
+        if capture
+        else None,
+    }
@@ -1,11 +1,79 @@
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    COMMAND_WINDOW,
+    DSRDTR,
+    HANDOFF,
+    HANDOFF_TIMEOUT,
+    LOGGER,
+    REDUNDANT_WRITE_MAX_AGE,
+    RTSCTS,
+    SERIAL_URL,
+    SET_ID,
+)
+from .lgtv_api import LgTv
 
 
 def update_ha_state(func):
     async def _decorator(self, *args, **kwargs):
         await func(self, *args, **kwargs)
+        # Follow up quickly on what the TV does with the command
+        self.coordinator.mark_active()
         # Trigger listeners with new optimistic data
         # Also resets polling delay so won't interfere with turn on/off
         self.coordinator.async_set_updated_data(self.coordinator.data)
         # self.async_write_ha_state()
 
     return _decorator
+
+
+def create_api(data: Mapping[str, Any]) -> LgTv:
+    """Create the API for the connection settings in config entry data."""
+    return LgTv(
+        data[SERIAL_URL],
+        data.get(SET_ID, 0),
+        data.get(RTSCTS, False),
+        data.get(DSRDTR, False),
+        window=COMMAND_WINDOW,
+        redundant_write_max_age=REDUNDANT_WRITE_MAX_AGE,
+    )
+
+
+@callback
+def async_hand_off_api(hass: HomeAssistant, serial_url: str, set_id: int, api: LgTv) -> None:
+    """
+    Keep a connected API, e.g. from the config flow, so setting up the entry can reuse it.
+
+    It gets closed when it is not taken within HANDOFF_TIMEOUT seconds.
+    """
+    handoffs: dict[tuple[str, int], tuple[LgTv, CALLBACK_TYPE]] = hass.data.setdefault(HANDOFF, {})
+    key = (serial_url, set_id)
+
+    @callback
+    def expire(_now) -> None:
+        if handoffs.get(key, (None,))[0] is api:
+            del handoffs[key]
+            LOGGER.debug("Closing unused connection to %s", serial_url)
+            hass.async_create_task(api.close())
+
+    if (previous := handoffs.pop(key, None)) is not None:
+        previous[1]()
+        hass.async_create_task(previous[0].close())
+    handoffs[key] = (
+        api,
+        async_call_later(hass, HANDOFF_TIMEOUT, HassJob(expire, cancel_on_shutdown=True)),
+    )
+
+
+@callback
+def async_take_api(hass: HomeAssistant, serial_url: str, set_id: int) -> LgTv | None:
+    """Take the API handed off for the TV, if any."""
+    if (handoff := hass.data.get(HANDOFF, {}).pop((serial_url, set_id), None)) is None:
+        return None
+    api, cancel_expire = handoff
+    cancel_expire()
+    return api
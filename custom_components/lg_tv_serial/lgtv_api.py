@@ -2,11 +2,20 @@
 
 import argparse
 import asyncio
-from dataclasses import dataclass
-from enum import IntEnum, unique
+import bisect
+from collections import deque
+from collections.abc import Awaitable, Callable
+import contextlib
+from dataclasses import dataclass, field, fields as dataclass_fields
+from enum import Enum, IntEnum, unique
+import heapq
+import json
+from itertools import count, takewhile
 import logging
-import re
+import random
+import string
 import sys
+from typing import Any, Generic, Iterable, TypeVar
 from serialx import SerialException
 
 import serialx
@@ -16,6 +25,45 @@ logger = logging.getLogger(__name__)
 
 END_MARKER = b"x"
 
+# Amount of bytes requested per read, responses are ~10 bytes so this usually gets a complete frame
+READ_CHUNK_SIZE = 64
+
+# Bounds in seconds for the time to wait for a response, the actual timeout is derived from measured round trip times
+COMMAND_TIMEOUT_MIN = 1.0
+COMMAND_TIMEOUT = 5.0
+
+# Seconds a background command can wait to be sent before it is considered stale
+BACKGROUND_STALE_AFTER = 10.0
+
+# Minimum seconds without incoming data before considering the connection back in sync
+RESYNC_QUIET_TIME = 0.25
+
+# Amount of times a command is sent again when it got invalidated by resynchronising
+RESYNC_RETRIES = 1
+
+# Commands sent to set ID 0 are handled by all TVs, they respond with their own set ID
+BROADCAST_SET_ID = 0
+
+# Seconds a TV can take to respond again after being turned on
+BOOT_TIMEOUT = 20.0
+
+# Seconds to wait for a response to the power query that checks if a booting TV is ready
+BOOT_PROBE_TIMEOUT = 0.5
+
+# Bounds in seconds for the delay between reconnect attempts, it doubles after every failed attempt
+RECONNECT_DELAY_MIN = 1.0
+RECONNECT_DELAY_MAX = 60.0
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket counts everything slower
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Default bound of the wire capture, in bytes of captured data
+CAPTURE_MAX_BYTES = 64 * 1024
+
+# Bytes that can be part of a frame, anything else (e.g. 0xFF) is junk
+FRAME_BYTES = b" 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_JUNK_BYTES = bytes(value for value in range(256) if value not in FRAME_BYTES + END_MARKER)
+
 
 @unique
 class RemoteKeyCode(IntEnum):
@@ -150,7 +198,7 @@ class EnergySaving(IntEnum):
     SCREEN_OFF = 0x05
 
 
-@dataclass
+@dataclass(slots=True)
 class Response:
     command2: str
     set_id: int
@@ -163,6 +211,86 @@ class Response:
     data5: int | None = None
 
 
+@dataclass(frozen=True)
+class _Query:
+    command1: str
+    command2: str
+    decode: Callable[[Response], Any]
+
+
+QUERIES: dict[str, _Query] = {
+    "power_on": _Query("k", "a", lambda response: response.data0 == 1),
+    "input": _Query("x", "b", lambda response: Input(response.data0)),
+    "volume": _Query("k", "f", lambda response: response.data0),
+    # Mute feels flipped, but is according to the documentation
+    # Data 00: Volume mute on (Volume off)
+    # Data 01: Volume mute off (Volume on)
+    "mute": _Query("k", "e", lambda response: response.data0 == 0),
+    "treble": _Query("k", "r", lambda response: response.data0),
+    "bass": _Query("k", "s", lambda response: response.data0),
+    "balance": _Query("k", "t", lambda response: response.data0),
+    "brightness": _Query("k", "h", lambda response: response.data0),
+    "contrast": _Query("k", "g", lambda response: response.data0),
+    "color": _Query("k", "i", lambda response: response.data0),
+    "color_temperature": _Query("x", "u", lambda response: response.data0),
+    "sharpness": _Query("k", "k", lambda response: response.data0),
+    "remote_control_lock": _Query("k", "m", lambda response: response.data0 == 1),
+    "energy_saving": _Query("j", "q", lambda response: EnergySaving(response.data0)),
+}
+
+# Field read and written by a command
+_QUERY_FIELDS = {(query.command1, query.command2): field for field, query in QUERIES.items()}
+
+# Data to send to read a value instead of setting it
+QUERY_DATA = 0xFF
+
+
+@unique
+class FieldStatus(Enum):
+    OK = "ok"
+    NG = "ng"
+    """TV responded with NG or a response that could not be used"""
+    TIMEOUT = "timeout"
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class FieldResult(Generic[T]):
+    status: FieldStatus
+    value: T | None = None
+
+
+@dataclass
+class Snapshot:
+    """Result of `LgTv.snapshot()`, fields that were not requested are None."""
+
+    power_on: FieldResult[bool] | None = None
+    input: FieldResult[Input] | None = None
+    volume: FieldResult[int] | None = None
+    mute: FieldResult[bool] | None = None
+    treble: FieldResult[int] | None = None
+    bass: FieldResult[int] | None = None
+    balance: FieldResult[int] | None = None
+    brightness: FieldResult[int] | None = None
+    contrast: FieldResult[int] | None = None
+    color: FieldResult[int] | None = None
+    color_temperature: FieldResult[int] | None = None
+    sharpness: FieldResult[int] | None = None
+    remote_control_lock: FieldResult[bool] | None = None
+    energy_saving: FieldResult[EnergySaving] | None = None
+
+    def value(self, field: str) -> Any:
+        """Value of the field or None when not available"""
+        result: FieldResult | None = getattr(self, field)
+        return result.value if result else None
+
+
+# Encoded " {value:02X}" for every possible data byte
+_HEX_BYTES = [f" {value:02X}".encode("ascii") for value in range(256)]
+
+
 def build_command(
     command1,
     command2,
@@ -174,73 +302,1167 @@ def build_command(
     data4: int | None = None,
     data5: int | None = None,
 ) -> bytes:
-    arguments = locals()
+    data = takewhile(lambda value: value is not None, (data0, data1, data2, data3, data4, data5))
+    prefix = f"{command1}{command2} {set_id:02X}".encode("ascii")
+    return prefix + b"".join(_HEX_BYTES[value] for value in data) + b"\r"  # type: ignore[index]
 
-    command_string = f"{command1}{command2} {set_id:02X}"
-    data_index = 0
-    while arguments[f"data{data_index}"] is not None:
-        data = arguments[f"data{data_index}"]
-        command_string += f" {data:02X}"
-        data_index += 1
-    command_string += "\r"  # CR
-    logger.debug("build_command string: %s" % command_string)
 
-    command = command_string.encode("ascii")
-    logger.debug("build_command bytes: %r" % command)
+class FrameEncoder:
+    """
+    Encodes command frames for one set ID.
 
-    return command
+    The "{command1}{command2} {set_id:02X}" prefix is prepared once per command.
+    Query frames and remote key frames are cached as ready to write bytes,
+    other frames with a single data byte get cached when first used.
+    """
+
+    def __init__(self, set_id: int) -> None:
+        self._set_id = set_id
+        self._prefixes: dict[tuple[str, str], bytes] = {}
+        self._frames: dict[tuple[str, str, int], bytes] = {}
 
+        for query in QUERIES.values():
+            self.encode(query.command1, query.command2, QUERY_DATA)
+        for code in RemoteKeyCode:
+            self.encode("m", "c", code)
 
-def parse_response(reponse: bytearray) -> Response | None:
+    def encode(
+        self,
+        command1: str,
+        command2: str,
+        data0: int,
+        data1: int | None = None,
+        data2: int | None = None,
+        data3: int | None = None,
+        data4: int | None = None,
+        data5: int | None = None,
+    ) -> bytes:
+        if data1 is None:
+            key = (command1, command2, data0)
+            if (frame := self._frames.get(key)) is None:
+                frame = self._frames[key] = self._prefix(command1, command2) + _HEX_BYTES[data0] + b"\r"
+            return frame
+
+        data = takewhile(lambda value: value is not None, (data0, data1, data2, data3, data4, data5))
+        return self._prefix(command1, command2) + b"".join(_HEX_BYTES[value] for value in data) + b"\r"  # type: ignore[index]
+
+    def _prefix(self, command1: str, command2: str) -> bytes:
+        if (prefix := self._prefixes.get((command1, command2))) is None:
+            prefix = self._prefixes[(command1, command2)] = f"{command1}{command2} {self._set_id:02X}".encode("ascii")
+        return prefix
+
+
+# Value of each hex digit, -1 for other bytes
+_NIBBLES = [int(chr(value), 16) if chr(value) in string.hexdigits else -1 for value in range(256)]
+
+_SPACE = ord(" ")
+_O = ord("O")
+_K = ord("K")
+
+
+def _hex_value(reponse: bytes | bytearray | memoryview, start: int, end: int) -> int:
+    """
+    Value of 1 or 2 hex digits.
+
+    A space next to a digit is allowed like int(..., 16) allows surrounding whitespace.
+    """
+    high = _NIBBLES[reponse[start]]
+    if end - start == 1:
+        if high < 0:
+            raise ValueError(f"Invalid hex value at {start}")
+        return high
+
+    low = _NIBBLES[reponse[start + 1]]
+    if high >= 0 and low >= 0:
+        return high << 4 | low
+    if high >= 0 and reponse[start + 1] == _SPACE:
+        return high
+    if low >= 0 and reponse[start] == _SPACE:
+        return low
+    raise ValueError(f"Invalid hex value at {start}")
+
+
+def parse_response(reponse: bytes | bytearray | memoryview) -> Response | None:
+    """
+    Parse a response frame like `a 01 OK01` without the end marker.
+
+    Works on the fixed positions in the frame, {cmd2} {set_id} {status}{data}
+    Returns None for NG responses and frames that do not look like a response.
+    """
     try:
-        match = re.match(
-            r"(?P<cmd2>.) (?P<set_id>\d\d) (?P<status>..)(?P<data>.+)",
-            reponse.decode("ascii"),
-        )
-        if match is None:
+        length = len(reponse)
+        if (
+            length < 8
+            or reponse[1] != _SPACE
+            or _NIBBLES[reponse[2]] < 0
+            or _NIBBLES[reponse[3]] < 0
+            or reponse[4] != _SPACE
+        ):
             logger.error("Could not match %s", reponse)
             return None
 
-        logger.debug(
-            "MATCH DATA: %s, %s, %s, %s",
-            match.group("cmd2"),
-            match.group("set_id"),
-            match.group("status"),
-            match.group("data"),
-        )
-        cmd2 = match.group("cmd2")
-        set_id = int(match.group("set_id"), 16)
-        status_ok = match.group("status") == "OK"
-
-        if not status_ok:
-            logger.warning("Status is '%s', not 'OK', for response: %s", match.group("status"), reponse)
+        if reponse[5] != _O or reponse[6] != _K:
+            logger.warning("Status is '%s', not 'OK', for response: %s", bytes(reponse[5:7]).decode("ascii", "replace"), reponse)
             return None
-        
-        data = match.group("data")
-        data_bytes = [int(data[i:i+2], 16) for i in range(0, min(len(data), 12), 2)]
+
+        set_id = _NIBBLES[reponse[2]] << 4 | _NIBBLES[reponse[3]]
+        if length == 9:
+            # Most responses have a single data byte
+            return Response(chr(reponse[0]), set_id, True, _hex_value(reponse, 7, 9))
+
         return Response(
-            cmd2,
+            chr(reponse[0]),
             set_id,
-            status_ok,
-            *data_bytes
+            True,
+            *[_hex_value(reponse, i, min(i + 2, length)) for i in range(7, min(length, 19), 2)],
         )
     except Exception as e:
-        logger.error("Could not parse data from %s" % reponse)
+        logger.error("Could not parse data from %s", reponse)
         raise e
 
 
+class FrameDecoder:
+    """
+    Splits a stream of bytes into frames terminated by `end_marker`.
+
+    Junk bytes (anything not in FRAME_BYTES) are dropped in bulk before framing.
+    Frames are returned without the end marker, empty frames are skipped.
+    """
+
+    def __init__(self, end_marker: bytes = END_MARKER) -> None:
+        assert len(end_marker) == 1
+        self._end_marker = end_marker
+        allowed = FRAME_BYTES + end_marker
+        self._junk = bytes(b for b in range(256) if b not in allowed)
+        self._buffer = bytearray()
+        self._frames: deque[bytes] = deque()
+        self.junk_bytes = 0
+
+    def feed(self, data: bytes) -> None:
+        cleaned = data.translate(None, self._junk)
+        self.junk_bytes += len(data) - len(cleaned)
+
+        if self._end_marker not in cleaned:
+            self._buffer += cleaned
+            return
+
+        self._buffer += cleaned
+        *frames, rest = self._buffer.split(self._end_marker)
+        self._frames.extend(bytes(frame) for frame in frames if frame)
+        self._buffer = rest
+
+    def next_frame(self) -> bytes | None:
+        """Returns the oldest complete frame or None if there is none yet."""
+        return self._frames.popleft() if self._frames else None
+
+    def clear(self) -> None:
+        """Drop all buffered data, including incomplete frames."""
+        self._buffer.clear()
+        self._frames.clear()
+
+
+@unique
+class Priority(IntEnum):
+    """Commands with a lower value get sent first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@unique
+class PowerState(Enum):
+    UNKNOWN = "unknown"
+    OFF = "off"
+    BOOTING = "booting"
+    """Turned on, but not responding yet"""
+    ON = "on"
+
+
+class CommandDropped(TimeoutError):
+    """Command waited too long to be sent and was dropped."""
+
+
+class StaleCommand(TimeoutError):
+    """Response for the command can not be trusted anymore."""
+
+
+@dataclass
+class PipelineCounters:
+    unmatched_responses: int = 0
+    """Responses that did not match any outstanding command"""
+    stale_frames: int = 0
+    """Frames discarded while resynchronising"""
+    resyncs: int = 0
+    retries: int = 0
+
+
+@dataclass
+class ConnectionStats:
+    attempts: int = 0
+    """Reconnect attempts, including the failed ones"""
+    reconnects: int = 0
+    downtime: float = 0.0
+    """Seconds without connection, not including the current outage"""
+    disconnected_at: float | None = None
+    """Event loop time the connection got lost, None while connected"""
+
+
+@dataclass
+class CommandStats:
+    """What happened on the wire for one kind of command."""
+
+    sent: int = 0
+    responses: int = 0
+    timeouts: int = 0
+    ng: int = 0
+    """Responses with a status other than OK"""
+    junk_bytes: int = 0
+    """Bytes dropped by the decoder while receiving the response, e.g. 0xFF"""
+    bytes_out: int = 0
+    bytes_in: int = 0
+    lock_wait: float = 0.0
+    """Seconds waited for a free slot in the window"""
+    latency_total: float = 0.0
+    latency_histogram: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    """Responses per bucket of LATENCY_BUCKETS"""
+
+    @property
+    def average_latency(self) -> float | None:
+        return self.latency_total / self.responses if self.responses else None
+
+    def add_latency(self, latency: float) -> None:
+        self.responses += 1
+        self.latency_total += latency
+        self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+
+@dataclass
+class QueueWaitStats:
+    """Time commands waited for a free slot in the window."""
+
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+    dropped: int = 0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, wait: float) -> None:
+        self.count += 1
+        self.total += wait
+        self.maximum = max(self.maximum, wait)
+
+
+@dataclass
+class TvStats:
+    """Everything measured for a TV, the pipeline values are shared by all TVs on the bus."""
+
+    commands: dict[tuple[str, str], CommandStats]
+    """Per (command1, command2)"""
+    connection: ConnectionStats
+    counters: PipelineCounters
+    queue_wait: dict[Priority, QueueWaitStats]
+    junk_bytes: int
+    """All bytes dropped by the decoder, also the ones not received with a response"""
+
+
+class _PriorityWindow:
+    """
+    Limits the amount of outstanding commands.
+
+    Commands waiting for a slot get it in order of priority, commands with
+    the same priority in the order they arrived.
+    """
+
+    def __init__(self, size: int) -> None:
+        assert size >= 1
+        self._free = size
+        self._waiters: list[tuple[Priority, int, asyncio.Future[None]]] = []
+        self._counter = count()
+        self.stats = {priority: QueueWaitStats() for priority in Priority}
+
+    async def acquire(self, priority: Priority, max_wait: float | None = None) -> None:
+        """Raises CommandDropped when no slot was available within `max_wait` seconds."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        if self._free and not self._waiters:
+            self._free -= 1
+        else:
+            future: asyncio.Future[None] = loop.create_future()
+            heapq.heappush(self._waiters, (priority, next(self._counter), future))
+            try:
+                async with asyncio.timeout(max_wait):
+                    await future
+            except BaseException as e:
+                if future.done() and not future.cancelled():
+                    # Got the slot at the same time, pass it on
+                    self.release()
+                else:
+                    future.cancel()
+                if isinstance(e, TimeoutError):
+                    self.stats[priority].dropped += 1
+                    raise CommandDropped("Command went stale while waiting to be sent") from e
+                raise
+
+        self.stats[priority].add(loop.time() - start)
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._free += 1
+
+
+class RttEstimator:
+    """
+    Derives the response timeout from measured round trip times.
+
+    Works like the TCP retransmission timeout (RFC 6298), a smoothed round trip time
+    and its variation are tracked and the timeout is `srtt + 4 * rttvar` within
+    `minimum` and `maximum`. Each timeout doubles it until the next measurement.
+    """
+
+    def __init__(self, minimum: float = COMMAND_TIMEOUT_MIN, maximum: float = COMMAND_TIMEOUT) -> None:
+        assert 0 < minimum <= maximum
+        self.minimum = minimum
+        self.maximum = maximum
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self._backoff = 1
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.maximum
+        timeout = (self.srtt + 4 * self.rttvar) * self._backoff
+        return min(max(timeout, self.minimum), self.maximum)
+
+    def update(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self._backoff = 1
+
+    def timed_out(self) -> None:
+        if self.timeout < self.maximum:
+            self._backoff *= 2
+
+
+@dataclass(eq=False)
+class _CoalescedWrite:
+    value: int
+    force: bool
+    future: asyncio.Future[None]
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureRecord:
+    time: float
+    """Event loop time, which is monotonic"""
+    sent: bool
+    data: bytes
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "time": self.time,
+            "direction": "tx" if self.sent else "rx",
+            "data": self.data.hex(),
+            "text": self.data.decode("ascii", "backslashreplace"),
+            "junk": 0 if self.sent else len(self.data) - len(self.data.translate(None, _JUNK_BYTES)),
+        }
+
+    @classmethod
+    def from_json(cls, record: dict[str, Any]) -> "CaptureRecord":
+        return cls(record["time"], record["direction"] == "tx", bytes.fromhex(record["data"]))
+
+
+class WireCapture:
+    """
+    Ring buffer with everything sent and received on a bus.
+
+    Received data is captured as read, so including junk bytes and data
+    that got discarded while resynchronising. The oldest records are dropped
+    when the captured data exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = CAPTURE_MAX_BYTES) -> None:
+        assert max_bytes > 0
+        self.max_bytes = max_bytes
+        self._records: deque[CaptureRecord] = deque()
+        self._size = 0
+        self.dropped = 0
+        """Records dropped to stay within `max_bytes`"""
+
+    def record(self, sent: bool, data: bytes) -> None:
+        self._records.append(CaptureRecord(asyncio.get_running_loop().time(), sent, data))
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            self._size -= len(self._records.popleft().data)
+            self.dropped += 1
+
+    @property
+    def records(self) -> list[CaptureRecord]:
+        return list(self._records)
+
+    def to_jsonl(self) -> str:
+        """One JSON object per line, see `CaptureRecord.to_json()`."""
+        return "".join(json.dumps(record.to_json()) + "\n" for record in self._records)
+
+
+class _ReplayWriter:
+    """The parts of asyncio.StreamWriter used by the pipeline and the bus."""
+
+    def __init__(self, replay: "ReplayTransport") -> None:
+        self._replay = replay
+        self._closing = False
+
+    def write(self, data: bytes) -> None:
+        self._replay._sent(data)
+
+    async def drain(self) -> None:
+        pass
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        self._closing = True
+        self._replay._close()
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+class ReplayTransport:
+    """
+    Plays back a captured session instead of talking to a TV, e.g. for benchmarks.
+
+    Pass `open_connection` as `open_connection` to `LgTv`. Every write gets the data
+    that was received after the corresponding sent record, in the same chunks,
+    including junk and duplicated responses. With `realtime` the original timing
+    is kept, otherwise everything is received as fast as possible.
+
+    Commands that differ from what was recorded are counted in `mismatches`,
+    the recorded data is replayed anyway.
+    """
+
+    def __init__(self, records: Iterable[CaptureRecord], realtime: bool = True) -> None:
+        self.realtime = realtime
+        self.mismatches = 0
+        self._initial: list[CaptureRecord] = []
+        self._exchanges: deque[tuple[CaptureRecord, list[CaptureRecord]]] = deque()
+        for record in records:
+            if record.sent:
+                self._exchanges.append((record, []))
+            elif self._exchanges:
+                self._exchanges[-1][1].append(record)
+            else:
+                self._initial.append(record)
+        self._reader: asyncio.StreamReader | None = None
+        self._playing: asyncio.Task | None = None
+
+    @classmethod
+    def from_jsonl(cls, jsonl: str, realtime: bool = True) -> "ReplayTransport":
+        """Replay the output of `WireCapture.to_jsonl()`."""
+        return cls(
+            (CaptureRecord.from_json(json.loads(line)) for line in jsonl.splitlines() if line.strip()),
+            realtime,
+        )
+
+    @property
+    def done(self) -> bool:
+        """Everything recorded has been replayed."""
+        return not self._exchanges and (self._playing is None or self._playing.done())
+
+    async def open_connection(self, **kwargs) -> tuple[asyncio.StreamReader, _ReplayWriter]:
+        """Same signature as `serialx.open_serial_connection`, the settings are ignored."""
+        self._reader = asyncio.StreamReader()
+        if self._initial:
+            self._play(self._initial[0].time, self._initial)
+            self._initial = []
+        return self._reader, _ReplayWriter(self)
+
+    def _sent(self, data: bytes) -> None:
+        if not self._exchanges:
+            logger.debug("Nothing recorded anymore for %s", data)
+            return
+        sent, received = self._exchanges.popleft()
+        if sent.data != data:
+            self.mismatches += 1
+            logger.debug("Sent %s, recorded %s", data, sent.data)
+        self._play(sent.time, received)
+
+    def _play(self, start_time: float, received: list[CaptureRecord]) -> None:
+        if received:
+            self._playing = asyncio.create_task(
+                self._receive(start_time, received, asyncio.get_running_loop().time(), self._playing)
+            )
+
+    async def _receive(
+        self,
+        start_time: float,
+        received: list[CaptureRecord],
+        started: float,
+        previous: asyncio.Task | None,
+    ) -> None:
+        if previous:
+            # Data received for the previous command comes first
+            await previous
+        loop = asyncio.get_running_loop()
+        for record in received:
+            if self.realtime and (delay := started + record.time - start_time - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            if self._reader is None:
+                return
+            self._reader.feed_data(record.data)
+            # Give the reader the chance to read the chunks separately like they were received
+            await asyncio.sleep(0)
+
+    def _close(self) -> None:
+        if self._playing:
+            self._playing.cancel()
+        if self._reader:
+            self._reader.feed_eof()
+            self._reader = None
+
+
+@dataclass(slots=True)
+class _CachedValue:
+    value: Any
+    data0: int
+    time: float
+
+
+@dataclass(eq=False)
+class _PendingCommand:
+    command2: str
+    set_id: int
+    future: asyncio.Future[bytes]
+    generation: int
+    stats: CommandStats | None = None
+    sent: float = 0.0
+    """Event loop time the command was written"""
+    service_time: float = 0.0
+    """Seconds the TV took to answer, not counting the time queued behind earlier commands"""
+
+    def addressed_to(self, set_id: int | None) -> bool:
+        return set_id is None or self.set_id in (BROADCAST_SET_ID, set_id)
+
+
+def _set_id(frame: bytes, start: int) -> int | None:
+    """Set ID in a command or response frame, None when it can not be determined."""
+    try:
+        return _hex_value(frame, start, start + 2)
+    except (ValueError, IndexError):
+        return None
+
+
+class CommandPipeline:
+    """
+    Sends commands and hands the response frames to the callers waiting for them.
+
+    The TV answers commands in the order they were received, so responses are
+    matched to outstanding commands in FIFO order by their command2 letter
+    and the set ID of the TV that responded.
+    At most `window` commands are outstanding, with a window of 1 a command
+    is only sent after the previous one got answered or timed out.
+    Commands waiting to be sent go first to last by priority.
+
+    When a response does not match any outstanding command or a command times out
+    (its response can still arrive later) the pipeline resynchronises in-band.
+    The generation is increased, outstanding commands of older generations become
+    stale and incoming frames are discarded until the line has been quiet for a bit.
+    Stale commands are sent again once the pipeline is back in sync.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        window: int = 1,
+        on_connection_lost: Callable[[], Awaitable[None]] | None = None,
+        rtt: RttEstimator | None = None,
+    ) -> None:
+        assert window >= 1
+        self._reader = reader
+        self._writer = writer
+        self._on_connection_lost = on_connection_lost
+        self.rtt = rtt or RttEstimator()
+        self._decoder = FrameDecoder()
+        self._window = _PriorityWindow(window)
+        self._pending: deque[_PendingCommand] = deque()
+        self._read_task: asyncio.Task | None = None
+        self._resync_task: asyncio.Task | None = None
+        self._exchanges: set[asyncio.Task[Any]] = set()
+        self._in_sync = asyncio.Event()
+        self._in_sync.set()
+        self._last_received = 0.0
+        self._last_answered = 0.0
+        self.generation = 0
+        self.counters = PipelineCounters()
+        self._junk_reported = 0
+        self.capture: WireCapture | None = None
+        self._closed = False
+
+    def start(self) -> None:
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def close(self) -> None:
+        if self._resync_task:
+            self._resync_task.cancel()
+        if self._read_task and self._read_task is not asyncio.current_task():
+            self._read_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._read_task
+        # Exchanges that sent their command fail with the pending command,
+        # the ones that did not send it yet fail when they get to it
+        self._closed = True
+        self._fail_pending(ConnectionError("Connection closed"))
+        self._in_sync.set()
+
+    async def _wait_until_sendable(self) -> None:
+        await self._in_sync.wait()
+        if self._closed:
+            raise ConnectionError("Connection closed")
+
+    @property
+    def queue_wait(self) -> dict[Priority, QueueWaitStats]:
+        return self._window.stats
+
+    @property
+    def junk_bytes(self) -> int:
+        return self._decoder.junk_bytes
+
+    async def execute(
+        self,
+        command: bytes,
+        command2: str,
+        timeout: float | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        max_wait: float | None = None,
+        stats: CommandStats | None = None,
+    ) -> bytes:
+        """
+        Send the command and return the response frame.
+
+        Without a `timeout` the timeout is derived from the measured round trip times.
+        Raises TimeoutError when no response was received in time and
+        CommandDropped when it could not be sent within `max_wait` seconds.
+
+        Once sent the exchange is shielded from cancellation of the caller,
+        the response still gets consumed so it can not end up with the next command.
+
+        What happens on the wire gets added to `stats`.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self._window.acquire(priority, max_wait)
+        if stats:
+            stats.lock_wait += loop.time() - start
+        exchange = asyncio.create_task(self._exchange(command, command2, timeout, stats))
+        self._exchanges.add(exchange)
+        exchange.add_done_callback(self._exchange_done)
+        return await asyncio.shield(exchange)
+
+    def _exchange_done(self, exchange: asyncio.Task[Any]) -> None:
+        self._exchanges.discard(exchange)
+        self._window.release()
+        if not exchange.cancelled() and exchange.exception() is not None:
+            # Retrieve the exception so it is not reported when the caller is gone already
+            logger.debug("Exchange failed: %s", exchange.exception())
+
+    async def execute_many(
+        self,
+        command: bytes,
+        command2: str,
+        set_ids: Iterable[int],
+        timeout: float | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        wait: bool = True,
+        stats: dict[int, CommandStats] | None = None,
+    ) -> dict[int, bytes | None]:
+        """
+        Send the command once and collect the responses of the TVs with `set_ids`.
+
+        Used for broadcasts (set ID 0) where every TV on the bus responds.
+        TVs that did not respond in time get None. With `wait` False it returns
+        as soon as the command is sent, the responses are still consumed.
+
+        What happens on the wire gets added to the `stats` of each set ID.
+        """
+        set_ids = tuple(set_ids)
+        stats = stats or {}
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self._window.acquire(priority)
+        for set_id_stats in stats.values():
+            set_id_stats.lock_wait += loop.time() - start
+        sent: asyncio.Future[None] = loop.create_future()
+        exchange = asyncio.create_task(self._exchange_many(command, command2, set_ids, timeout, sent, stats))
+        self._exchanges.add(exchange)
+        exchange.add_done_callback(self._exchange_done)
+        if not wait:
+            await asyncio.wait((sent, exchange), return_when=asyncio.FIRST_COMPLETED)
+            if not exchange.done():
+                return dict.fromkeys(set_ids)
+        return await asyncio.shield(exchange)
+
+    async def _exchange_many(
+        self,
+        command: bytes,
+        command2: str,
+        set_ids: tuple[int, ...],
+        timeout: float | None,
+        sent: asyncio.Future[None],
+        stats: dict[int, CommandStats],
+    ) -> dict[int, bytes | None]:
+        await self._wait_until_sendable()
+
+        loop = asyncio.get_running_loop()
+        pendings = [
+            _PendingCommand(command2, set_id, loop.create_future(), self.generation, stats.get(set_id))
+            for set_id in set_ids
+        ]
+        self._pending.extend(pendings)
+        try:
+            async with asyncio.timeout(timeout if timeout is not None else self.rtt.timeout):
+                now = loop.time()
+                for pending in pendings:
+                    pending.sent = now
+                    if pending.stats:
+                        pending.stats.sent += 1
+                        pending.stats.bytes_out += len(command)
+                        pending.future.add_done_callback(self._add_latency(pending))
+                self._writer.write(command)
+                if self.capture:
+                    self.capture.record(True, command)
+                sent.set_result(None)
+                await self._writer.drain()
+                await asyncio.wait([pending.future for pending in pendings])
+        except TimeoutError:
+            # TVs that did not respond might still do so later
+            self._resync("Not all TVs responded in time")
+        finally:
+            for pending in pendings:
+                if pending in self._pending:
+                    self._pending.remove(pending)
+
+        results: dict[int, bytes | None] = {}
+        for pending in pendings:
+            if not pending.future.done():
+                results[pending.set_id] = None
+            elif isinstance(error := pending.future.exception(), ConnectionError):
+                raise error
+            else:
+                results[pending.set_id] = None if error else pending.future.result()
+        return results
+
+    @staticmethod
+    def _add_latency(pending: _PendingCommand) -> Callable[[asyncio.Future[bytes]], None]:
+        def add_latency(future: asyncio.Future[bytes]) -> None:
+            if pending.stats and not future.cancelled() and future.exception() is None:
+                pending.stats.add_latency(asyncio.get_running_loop().time() - pending.sent)
+
+        return add_latency
+
+    async def _exchange(
+        self, command: bytes, command2: str, timeout: float | None, stats: CommandStats | None
+    ) -> bytes:
+        for attempt in range(RESYNC_RETRIES + 1):
+            try:
+                return await self._send(command, command2, timeout, stats)
+            except StaleCommand:
+                if attempt == RESYNC_RETRIES:
+                    raise
+                self.counters.retries += 1
+                logger.debug("Retrying %s", command)
+        raise AssertionError("Not reached")
+
+    async def _send(
+        self, command: bytes, command2: str, timeout: float | None, stats: CommandStats | None
+    ) -> bytes:
+        await self._wait_until_sendable()
+
+        loop = asyncio.get_running_loop()
+        pending = _PendingCommand(
+            command2,
+            _set_id(command, 3) or BROADCAST_SET_ID,
+            loop.create_future(),
+            self.generation,
+            stats,
+        )
+        self._pending.append(pending)
+        try:
+            async with asyncio.timeout(timeout if timeout is not None else self.rtt.timeout):
+                pending.sent = loop.time()
+                self._writer.write(command)
+                if self.capture:
+                    self.capture.record(True, command)
+                if stats:
+                    stats.sent += 1
+                    stats.bytes_out += len(command)
+                await self._writer.drain()
+                frame = await pending.future
+            self.rtt.update(pending.service_time)
+            if stats:
+                stats.add_latency(loop.time() - pending.sent)
+            return frame
+        except StaleCommand:
+            raise
+        except TimeoutError:
+            if timeout is None:
+                # Only back off when the estimate was too short, not when the caller chose to wait shorter
+                self.rtt.timed_out()
+            # The response might still arrive and would then be taken as response for a next command
+            self._resync("No response in time")
+            raise
+        finally:
+            if pending in self._pending:
+                self._pending.remove(pending)
+
+    def _resync(self, reason: str) -> None:
+        logger.debug("Resynchronising: %s", reason)
+        self.counters.resyncs += 1
+        self.generation += 1
+        for pending in self._pending:
+            if pending.generation < self.generation and not pending.future.done():
+                pending.future.set_exception(StaleCommand(reason))
+        self._pending.clear()
+
+        self._in_sync.clear()
+        self._last_received = asyncio.get_running_loop().time()
+        if self._resync_task is None or self._resync_task.done():
+            self._resync_task = asyncio.create_task(self._wait_until_quiet())
+
+    async def _wait_until_quiet(self) -> None:
+        """Wait until nothing was received for a bit, everything received until then is stale."""
+        loop = asyncio.get_running_loop()
+        quiet_time = max(RESYNC_QUIET_TIME, 2 * (self.rtt.srtt or 0))
+        while (remaining := self._last_received + quiet_time - loop.time()) > 0:
+            await asyncio.sleep(remaining)
+        self._decoder.clear()
+        self._in_sync.set()
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                self._dispatch(await self._read_frame())
+        except (ConnectionError, SerialException, OSError) as e:
+            logger.warning("Connection error", exc_info=True)
+            self._fail_pending(ConnectionError("Connection lost"))
+            if self._on_connection_lost:
+                await self._on_connection_lost()
+
+    async def _read_frame(self) -> bytes:
+        """
+        Read until a complete frame is available.
+
+        Reads whatever is available instead of byte by byte.
+        Sometimes weird values are read from the device e.g. 0xFF,
+        the decoder drops those so they can not end up in a frame.
+        """
+        while (frame := self._decoder.next_frame()) is None:
+            data = await self._reader.read(READ_CHUNK_SIZE)
+            if data == b"":
+                raise ConnectionError("No data, connection lost")
+            self._last_received = asyncio.get_running_loop().time()
+            if self.capture:
+                self.capture.record(False, data)
+            self._decoder.feed(data)
+        return frame
+
+    def _dispatch(self, frame: bytes) -> None:
+        if not self._in_sync.is_set():
+            self.counters.stale_frames += 1
+            logger.debug("Discarding stale frame: %s", frame)
+            return
+
+        command2 = chr(frame[0])
+        set_id = _set_id(frame, 2)
+        skipped = []
+        for pending in self._pending:
+            if not pending.addressed_to(set_id):
+                continue
+            if pending.command2 == command2:
+                break
+            skipped.append(pending)
+        else:
+            # I have seen situations where somehow a response was in the buffer twice so everything got out of sync.
+            # Resynchronise instead of failing the connection.
+            self.counters.unmatched_responses += 1
+            self._resync(f"Response not matching any command: {frame!r}")
+            return
+
+        # The TV answers in order, so commands sent to it before the matching one will not get a response anymore
+        for command in skipped:
+            self._pending.remove(command)
+            if not command.future.done():
+                command.future.set_exception(StaleCommand("Skipped by the TV"))
+
+        self._pending.remove(pending)
+        # The TV handles one command at a time, a command written while the previous one was
+        # still being handled only got the TV's attention once that one was answered
+        now = asyncio.get_running_loop().time()
+        pending.service_time = now - max(pending.sent, self._last_answered)
+        self._last_answered = now
+        if pending.stats:
+            # Junk that arrived since the previous response is counted for this one
+            junk = self._decoder.junk_bytes - self._junk_reported
+            pending.stats.junk_bytes += junk
+            pending.stats.bytes_in += len(frame) + len(END_MARKER) + junk
+        self._junk_reported = self._decoder.junk_bytes
+        if not pending.future.done():
+            pending.future.set_result(frame)
+
+    def _fail_pending(self, exception: Exception) -> None:
+        while self._pending:
+            pending = self._pending.popleft()
+            if not pending.future.done():
+                pending.future.set_exception(exception)
+
+
+class SerialBus:
+    """
+    Serial connection shared by all TVs on it.
+
+    LG TVs can be daisy-chained on one RS-232 line, or one serial-over-IP gateway,
+    and are addressed by their set ID. All TVs using the same serial url share
+    one connection and one pipeline, responses are routed by the set ID in the reply.
+
+    Use `SerialBus.get()` to get the bus for a serial url. The connection is opened
+    when the first TV attaches and closed when the last one detaches.
+    """
+
+    _buses: dict[str, "SerialBus"] = {}
+
+    def __init__(
+        self,
+        serial_url,
+        rtscts=False,
+        dsrdtr=False,
+        window=1,
+        min_timeout=COMMAND_TIMEOUT_MIN,
+        max_timeout=COMMAND_TIMEOUT,
+        open_connection=None,
+    ) -> None:
+        self._serial_url = serial_url
+        self._rtscts = rtscts
+        self._dsrdtr = dsrdtr
+        self._window = window
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self._open_connection = open_connection or serialx.open_serial_connection
+        self._handles: dict[object, Callable[[], Awaitable[None]]] = {}
+        self._lock = asyncio.Lock()
+        self._writer: asyncio.StreamWriter | None = None
+        self.pipeline: CommandPipeline | None = None
+        self._capture: WireCapture | None = None
+
+    @property
+    def capture(self) -> WireCapture | None:
+        return self._capture
+
+    @capture.setter
+    def capture(self, capture: WireCapture | None) -> None:
+        """Capture the traffic in `capture`, also after reconnecting. None stops capturing."""
+        self._capture = capture
+        if self.pipeline:
+            self.pipeline.capture = capture
+
+    @classmethod
+    def get(cls, serial_url, **kwargs) -> "SerialBus":
+        """
+        Bus for the serial url, created with `kwargs` when there is none yet.
+
+        The settings of an existing bus are kept, TVs on one line use the same settings anyway.
+        """
+        if (bus := cls._buses.get(serial_url)) is None:
+            bus = cls._buses[serial_url] = cls(serial_url, **kwargs)
+        return bus
+
+    async def attach(self, handle: object, on_connection_lost: Callable[[], Awaitable[None]]) -> None:
+        """
+        Start using the bus, opens the connection when needed.
+
+        `on_connection_lost` will be called when the connection stops working.
+        """
+        self._handles[handle] = on_connection_lost
+        try:
+            async with self._lock:
+                if self.pipeline is None:
+                    await self._open()
+        except BaseException:
+            await self.detach(handle)
+            raise
+
+    async def reopen(self) -> None:
+        """
+        Open the connection again after it got lost, when not done already.
+
+        Unlike `attach()` a failure keeps everybody on the bus,
+        so they can keep trying without another bus being created for the serial url.
+        """
+        async with self._lock:
+            if self.pipeline is None:
+                await self._open()
+
+    async def detach(self, handle: object) -> None:
+        """Stop using the bus, closes the connection when nobody uses it anymore."""
+        self._handles.pop(handle, None)
+        if not self._handles:
+            if self._buses.get(self._serial_url) is self:
+                del self._buses[self._serial_url]
+            await self._close()
+
+    @property
+    def handles(self) -> set[object]:
+        """Everybody using the bus."""
+        return set(self._handles)
+
+    async def connection_lost(self) -> None:
+        """Close the connection and report it to everybody using the bus."""
+        if self.pipeline is None:
+            # Already handled
+            return
+        await self._close()
+        for on_connection_lost in list(self._handles.values()):
+            await on_connection_lost()
+
+    async def _open(self) -> None:
+        try:
+            (reader, self._writer) = (
+                await self._open_connection(
+                    url=self._serial_url, baudrate=9600,
+                    rtscts=self._rtscts, dsrdtr=self._dsrdtr
+                )
+            )
+        except (SerialException, OSError) as e:
+            raise ConnectionError("Could not connect to LG TV, check the port settings") from e
+
+        self.pipeline = CommandPipeline(
+            reader,
+            self._writer,
+            self._window,
+            self.connection_lost,
+            RttEstimator(self._min_timeout, self._max_timeout),
+        )
+        self.pipeline.capture = self._capture
+        self.pipeline.start()
+
+    async def _close(self) -> None:
+        pipeline, self.pipeline = self.pipeline, None
+        writer, self._writer = self._writer, None
+
+        if pipeline:
+            await pipeline.close()
+
+        if writer:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                logger.debug("Connection error while closing", exc_info=True)
+            except (SerialException, OSError):
+                logger.debug("Serial exception error while closing", exc_info=True)
+
+
 class LgTv:
-    """Control an LG TV with serial port."""
+    """
+    Control an LG TV with serial port.
+
+    TVs with the same `serial_url` share one connection, see `SerialBus`.
+    """
 
-    def __init__(self, serial_url, set_id=0, rtscts=False, dsrdtr=False) -> None:
+    def __init__(
+        self,
+        serial_url,
+        set_id=0,
+        rtscts=False,
+        dsrdtr=False,
+        window=1,
+        min_timeout=COMMAND_TIMEOUT_MIN,
+        max_timeout=COMMAND_TIMEOUT,
+        stale_after=BACKGROUND_STALE_AFTER,
+        cache_ttl: dict[str, float] | None = None,
+        redundant_write_max_age: float | None = None,
+        reconnect_delay_min=RECONNECT_DELAY_MIN,
+        reconnect_delay_max=RECONNECT_DELAY_MAX,
+        open_connection=None,
+    ) -> None:
+        """
+        `window` is the amount of commands that can be outstanding at the same time.
+        The default of 1 waits for each response before sending the next command.
+
+        The time to wait for a response adapts to the measured round trip times
+        within `min_timeout` and `max_timeout` seconds. All commands accept
+        a `timeout` to use instead.
+
+        Setters and remote keys are sent before queries that are waiting to be sent,
+        queries that waited longer than `stale_after` seconds are dropped.
+
+        The connection settings and `window` of the first TV on a serial url are used for the bus.
+
+        Values read from or confirmed by the TV are cached. Getters and `snapshot()`
+        return cached values younger than `cache_ttl` seconds for the field,
+        or younger than their `max_age` argument. Without either the TV is always queried.
+
+        With `redundant_write_max_age` setters skip the write when the TV reported
+        the same value at most that many seconds ago, unless called with `force=True`.
+        Power is always written.
+
+        A TV does not respond while it boots after being turned on. Until a probe
+        gets a response, getters, setters and `snapshot()` wait instead of timing out.
+
+        Reconnect attempts, see `connect()`, start after `reconnect_delay_min` seconds
+        and the delay doubles up to `reconnect_delay_max` seconds, with some randomness
+        so TVs sharing a gateway do not all retry at the same moment.
+
+        `open_connection` replaces `serialx.open_serial_connection`, e.g. with
+        `ReplayTransport.open_connection` to replay a captured session.
+        """
         self._serial_url = serial_url
         self._set_id = set_id
         self._rtscts = rtscts
         self._dsrdtr = dsrdtr
-        self._lock = asyncio.Lock()
+        self._window = window
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self._stale_after = stale_after
+        self._encoder = FrameEncoder(set_id)
         self._on_disconnect = None
-        self._writer: asyncio.StreamWriter | None = None
-        self._reader: asyncio.StreamReader
+        self._bus: SerialBus | None = None
+        self._writes_in_progress: set[tuple[str, str]] = set()
+        self._next_writes: dict[tuple[str, str], _CoalescedWrite] = {}
+        self.coalesced_writes = 0
+        self._cache_ttl = dict(cache_ttl or {})
+        self._cache: dict[str, _CachedValue] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._reads_in_flight: dict[str, asyncio.Task[tuple[bytes | None, Response | None]]] = {}
+        self.merged_reads = 0
+        self._redundant_write_max_age = redundant_write_max_age
+        self.skipped_writes = 0
+        self._power_state = PowerState.UNKNOWN
+        self._ready = asyncio.Event()
+        self._ready.set()
+        self._boot_probe: asyncio.Task | None = None
+        self._reconnect_delay_min = reconnect_delay_min
+        self._reconnect_delay_max = reconnect_delay_max
+        self._on_reconnect = None
+        self._reconnect = False
+        self._reconnect_task: asyncio.Task | None = None
+        self._connected = False
+        self.connection_stats = ConnectionStats()
+        self._command_stats: dict[tuple[str, str], CommandStats] = {}
+        self._open_connection = open_connection
 
     async def __aenter__(self):
         return self
@@ -248,27 +1470,55 @@ class LgTv:
     async def __aexit__(self, exc_type, exc, tb):
         await self.close()
 
-    async def connect(self, on_disconnect=None):
+    @property
+    def set_id(self) -> int:
+        return self._set_id
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def connect(self, on_disconnect=None, on_reconnect=None, *, reconnect=False):
         """
         `on_disconnect` will be called when it is detected that a connection is not working anymore.
         It will _not_ be called when calling `close()` manually.
+
+        With `reconnect` the connection gets reopened in the background after it got lost
+        and `on_reconnect` is called when it works again. Commands fail with a
+        `ConnectionError` until then.
+
+        Connecting an already connected TV only installs the new callbacks,
+        e.g. to take over a connection that was opened to validate the settings.
         """
+        if self._connected:
+            self._on_disconnect = on_disconnect
+            self._on_reconnect = on_reconnect
+            self._reconnect = reconnect
+            return
+
+        bus = SerialBus.get(
+            self._serial_url,
+            rtscts=self._rtscts,
+            dsrdtr=self._dsrdtr,
+            window=self._window,
+            min_timeout=self._min_timeout,
+            max_timeout=self._max_timeout,
+            open_connection=self._open_connection,
+        )
+        await bus.attach(self, self._connection_lost)
+        self._bus = bus
+
         connected = False
         try:
-            (self._reader, self._writer) = (
-                await serialx.open_serial_connection(
-                    url=self._serial_url, baudrate=9600,
-                    rtscts=self._rtscts, dsrdtr=self._dsrdtr
-                )
-            )
-
             # Do something with the connection to make sure it can transfer data
             await self.get_power_on()
 
             # Only install on_disconnect after connection seems to work to avoid triggering it while not really connected
             self._on_disconnect = on_disconnect
+            self._on_reconnect = on_reconnect
+            self._reconnect = reconnect
 
-            connected = True
+            connected = self._connected = True
         except (SerialException, OSError) as e:
             raise ConnectionError("Could not connect to LG TV, check the port settings") from e
         finally:
@@ -279,17 +1529,73 @@ class LgTv:
         await self._close(False)
 
     async def _close(self, call_on_disconnect):
-        if call_on_disconnect and self._on_disconnect:
+        if call_on_disconnect:
+            await self._connection_lost()
+        self._connected = False
+        self._reconnect = False
+        if self._reconnect_task and self._reconnect_task is not asyncio.current_task():
+            self._reconnect_task.cancel()
+
+        if self._boot_probe:
+            self._boot_probe.cancel()
+        self._set_power_state(PowerState.UNKNOWN)
+
+        if self._bus:
+            bus, self._bus = self._bus, None
+            await bus.detach(self)
+
+    async def _connection_lost(self):
+        if not self._connected:
+            # Both the reader and the callers can detect a lost connection, only report it once
+            return
+        self._connected = False
+        self.connection_stats.disconnected_at = asyncio.get_running_loop().time()
+        if self._reconnect:
+            self._reconnect_task = asyncio.create_task(self._reconnect_loop())
+        if self._on_disconnect:
             await self._on_disconnect()
 
-        if self._writer:
+    async def _reconnect_loop(self) -> None:
+        """Reopen the connection until it works, waiting longer after every failed attempt."""
+        delay = self._reconnect_delay_min
+        attempts = 0
+        while True:
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, self._reconnect_delay_max)
+            if self._bus is None:
+                return
+
+            attempts += 1
+            self.connection_stats.attempts += 1
             try:
-                self._writer.close()
-                await self._writer.wait_closed()
-            except ConnectionError:
-                logger.debug("Connection error while closing", exc_info=True)
-            except (SerialException, OSError):
-                logger.debug("Serial exception error while closing", exc_info=True)
+                # Another TV on the bus might already have reopened it
+                await self._bus.reopen()
+                # Make sure the connection can transfer data, like `connect()`
+                await self._query("power_on")
+            except (ConnectionError, SerialException, OSError, ValueError):
+                # A garbled response while the TV is coming back is just a failed attempt
+                logger.debug("Reconnect attempt %d failed", attempts, exc_info=True)
+                continue
+            except Exception:
+                logger.exception("Unexpected error in reconnect attempt %d", attempts)
+                continue
+            if self._bus is None or self._bus.pipeline is None:
+                continue
+            break
+
+        stats = self.connection_stats
+        assert stats.disconnected_at is not None
+        stats.downtime += asyncio.get_running_loop().time() - stats.disconnected_at
+        stats.disconnected_at = None
+        stats.reconnects += 1
+        self._connected = True
+        logger.info("Reconnected after %d attempts", attempts)
+        if self._on_reconnect:
+            await self._on_reconnect()
+
+    @property
+    def _pipeline(self) -> CommandPipeline | None:
+        return self._bus.pipeline if self._bus else None
 
     async def _do_command(
         self,
@@ -301,238 +1607,501 @@ class LgTv:
         data3: int | None = None,
         data4: int | None = None,
         data5: int | None = None,
+        *,
+        timeout: float | None = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Response | None:
-        async with self._lock:
-            command = build_command(
-                command1,
-                command2,
-                self._set_id,
-                data0,
-                data1,
-                data2,
-                data3,
-                data4,
-                data5,
-            )
-
-            try:
-                async with asyncio.timeout(5):
-                    assert self._writer is not None
-                    self._writer.write(command)
-                    await self._writer.drain()
-
-                    response = bytearray()
-                    while True:
-                        data = await self._reader.read(1)
-                        # logger.debug(data)
-                        if data == b"":
-                            raise ConnectionError("No data, connection lost")
-                        elif data == b" " or data.isalnum():
-                            if data == END_MARKER:
-                                logger.debug("parsing data: %s" % response)
-                                result = parse_response(response)
-                                if result and result.command2 != command2:
-                                    # I have seen situations where somehow a response was in the buffer twice so everything got out of sync.
-                                    # Not sure why it happens, just detect and pretend it was a connection error and hope it fixes itself
-                                    # TODO: This needs some more robust handling
-                                    raise ConnectionError(
-                                        "Response not for command that was sent"
-                                    )
-
-                                return result
-
-                            response.extend(data)
-                        else:
-                            # Sometimes weird values are read from the device e.g. 0xFF
-                            # Lets just ignore those.
-                            # These might have actually been the cause of the out-of-sync issue
-                            # since before the receiving would be "complete"
-                            # Now just ignore those values completely and move on.
-                            # I have only seen these weird values alone or before the actual command
-                            # so that should work out fine
-                            continue
-            except TimeoutError:
-                logger.warning("Timeout while waiting for response")
-            except ConnectionError as e:
-                logger.warning("Connection error", exc_info=True)
-                await self._close(True)
-                raise e
-            except (SerialException, OSError) as e:
-                logger.warning("Serial error", exc_info=True)
-                # Why try to close? Can result in more exceptions...
-                # Not sure what happens then
-                await self._close(True)
-                raise ConnectionError("Serial connection error") from e
+        command = self._encoder.encode(
+            command1,
+            command2,
+            data0,
+            data1,
+            data2,
+            data3,
+            data4,
+            data5,
+        )
 
+        stats = self._stats_for(command1, command2)
+        frame = await self._execute(command, command2, timeout, priority, stats)
+        response = None
+        if frame is not None:
+            logger.debug("parsing data: %s", frame)
+            if (response := parse_response(frame)) is None:
+                stats.ng += 1
+
+        self._update_cache(command1, command2, data0, response)
+        if (command1, command2) == ("k", "a"):
+            self._update_power_state(data0, frame, response)
+        return response
+
+    def _from_cache(self, field: str, max_age: float | None) -> _CachedValue | None:
+        if max_age is None and (max_age := self._cache_ttl.get(field)) is None:
             return None
 
-    async def set_power_on(self, value: bool) -> None:
-        await self._do_command("k", "a", 1 if value else 0)
-
-    async def get_power_on(self) -> bool | None:
-        response = await self._do_command("k", "a", 0xFF)
-        if response and response.status_ok:
-            return response.data0 == 1
+        cached = self._cache.get(field)
+        if cached is not None and asyncio.get_running_loop().time() - cached.time <= max_age:
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
         return None
 
-    async def set_mute(self, mute: bool) -> None:
-        await self._do_command("k", "e", 0 if mute else 1)
+    def _is_redundant_write(self, command1: str, command2: str, data0: int) -> bool:
+        """The TV recently reported the value that would be written."""
+        if self._redundant_write_max_age is None:
+            return False
+        field = _QUERY_FIELDS.get((command1, command2))
+        if field in (None, "power_on") or (cached := self._cache.get(field)) is None:
+            return False
+        if (
+            cached.data0 != data0
+            or asyncio.get_running_loop().time() - cached.time > self._redundant_write_max_age
+        ):
+            return False
+        self.skipped_writes += 1
+        logger.debug("Skipping write of %s, value already %s", field, cached.value)
+        return True
+
+    async def _set(
+        self, command1: str, command2: str, value: int, timeout: float | None, force: bool
+    ) -> None:
+        await self._ready.wait()
+        if force or not self._is_redundant_write(command1, command2, value):
+            await self._do_command(command1, command2, value, timeout=timeout)
+
+    def _update_cache(self, command1: str, command2: str, data0: int, response: Response | None) -> None:
+        """Cache the value the TV responded with, responses to setters contain the new value."""
+        field = _QUERY_FIELDS.get((command1, command2))
+        if data0 != QUERY_DATA and field in (None, "power_on"):
+            # Power changes and other commands, like remote keys, can change any value
+            self._cache.clear()
+        if field is None:
+            return
+
+        if response is not None and response.status_ok:
+            self._cache[field] = _CachedValue(
+                QUERIES[field].decode(response), response.data0, asyncio.get_running_loop().time()
+            )
+        else:
+            self._cache.pop(field, None)
+
+    @property
+    def power_state(self) -> PowerState:
+        return self._power_state
+
+    def _set_power_state(self, power_state: PowerState) -> None:
+        if power_state is not self._power_state:
+            logger.debug("Power state %s -> %s", self._power_state.value, power_state.value)
+        self._power_state = power_state
+        if power_state is PowerState.BOOTING:
+            self._ready.clear()
+        else:
+            self._ready.set()
+
+    def _update_power_state(self, data0: int, frame: bytes | None, response: Response | None) -> None:
+        if data0 != QUERY_DATA:
+            if frame is None:
+                # Unknown if the TV got the command
+                self._set_power_state(PowerState.UNKNOWN)
+            elif response is None:
+                return
+            elif data0 and self._power_state is not PowerState.ON:
+                self._set_power_state(PowerState.BOOTING)
+                if self._boot_probe is None or self._boot_probe.done():
+                    self._boot_probe = asyncio.create_task(self._probe_until_ready())
+            elif not data0:
+                self._set_power_state(PowerState.OFF)
+        elif frame is not None:
+            # Any response means the TV is ready
+            self._set_power_state(
+                PowerState.ON if response is not None and response.data0 else PowerState.OFF
+            )
+
+    async def _probe_until_ready(self) -> None:
+        """Query the power state until the booting TV responds."""
+        deadline = asyncio.get_running_loop().time() + BOOT_TIMEOUT
+        try:
+            while self._power_state is PowerState.BOOTING:
+                if asyncio.get_running_loop().time() >= deadline:
+                    logger.warning("TV did not respond within %s seconds after turning on", BOOT_TIMEOUT)
+                    return
+                try:
+                    await self._read("power_on", BOOT_PROBE_TIMEOUT, Priority.INTERACTIVE)
+                except ValueError:
+                    # Garbled response, the TV might still be starting up
+                    logger.debug("Invalid response to boot probe", exc_info=True)
+                    await asyncio.sleep(BOOT_PROBE_TIMEOUT)
+                except ConnectionError:
+                    return
+        finally:
+            # Never leave callers waiting for a TV nobody is probing anymore
+            if self._power_state is PowerState.BOOTING:
+                self._set_power_state(PowerState.UNKNOWN)
+
+    async def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """Wait until a TV that was turned on responds. Returns False on timeout."""
+        try:
+            async with asyncio.timeout(timeout):
+                await self._ready.wait()
+        except TimeoutError:
+            return False
+        return True
 
-    async def get_mute(self) -> bool | None:
-        response = await self._do_command("k", "e", 0xFF)
+    async def _execute(
+        self,
+        command: bytes,
+        command2: str,
+        timeout: float | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        stats: CommandStats | None = None,
+    ) -> bytes | None:
+        """Returns the response frame or None on timeout."""
+        if (pipeline := self._pipeline) is None:
+            raise ConnectionError("Not connected")
+        try:
+            return await pipeline.execute(
+                command,
+                command2,
+                timeout,
+                priority,
+                self._stale_after if priority is Priority.BACKGROUND else None,
+                stats,
+            )
+        except CommandDropped:
+            logger.debug("Dropped stale command %s", command)
+            return None
+        except TimeoutError as e:
+            # Expected while the TV boots, so not worth a warning or counting it
+            booting = self._power_state is PowerState.BOOTING
+            if stats and not booting and not isinstance(e, StaleCommand):
+                stats.timeouts += 1
+            logger.log(
+                logging.DEBUG if booting else logging.WARNING,
+                "Timeout while waiting for response",
+            )
+            return None
+        except ConnectionError as e:
+            logger.warning("Connection error", exc_info=True)
+            await self._bus_connection_lost()
+            raise e
+        except (SerialException, OSError) as e:
+            logger.warning("Serial error", exc_info=True)
+            # Why try to close? Can result in more exceptions...
+            # Not sure what happens then
+            await self._bus_connection_lost()
+            raise ConnectionError("Serial connection error") from e
+
+    async def _bus_connection_lost(self) -> None:
+        # The connection is shared, so it is lost for all TVs on the bus
+        if self._bus:
+            await self._bus.connection_lost()
+
+    async def _query(self, field: str, timeout: float | None = None, max_age: float | None = None) -> Any:
+        await self._ready.wait()
+        if (cached := self._from_cache(field, max_age)) is not None:
+            return cached.value
+
+        _, response = await self._read(field, timeout, Priority.BACKGROUND)
         if response and response.status_ok:
-            # Mute feels flipped, but is according to the documentation
-            # Data 00: Volume mute on (Volume off)
-            # Data 01: Volume mute off (Volume on)
-            return response.data0 == 0
+            return QUERIES[field].decode(response)
         return None
 
-    async def set_volume(self, value: int) -> None:
+    async def _read(
+        self, field: str, timeout: float | None, priority: Priority
+    ) -> tuple[bytes | None, Response | None]:
+        """
+        Query the field and return the response frame and parsed response.
+
+        Identical queries that are in flight are merged, only one frame
+        gets sent and all callers get its response.
+        """
+        if (read := self._reads_in_flight.get(field)) is None:
+            read = asyncio.create_task(self._do_read(field, timeout, priority))
+            self._reads_in_flight[field] = read
+            read.add_done_callback(lambda read: self._read_done(field, read))
+        else:
+            self.merged_reads += 1
+        # Shielded so the other callers still get the response when the first one is cancelled
+        return await asyncio.shield(read)
+
+    async def _do_read(
+        self, field: str, timeout: float | None, priority: Priority
+    ) -> tuple[bytes | None, Response | None]:
+        query = QUERIES[field]
+        stats = self._stats_for(query.command1, query.command2)
+        frame = await self._execute(
+            self._encoder.encode(query.command1, query.command2, QUERY_DATA),
+            query.command2,
+            timeout,
+            priority,
+            stats,
+        )
+        response = None
+        if frame is not None:
+            logger.debug("parsing data: %s", frame)
+            if (response := parse_response(frame)) is None:
+                stats.ng += 1
+        self._update_cache(query.command1, query.command2, QUERY_DATA, response)
+        if field == "power_on":
+            self._update_power_state(QUERY_DATA, frame, response)
+        return frame, response
+
+    def _read_done(self, field: str, read: asyncio.Task) -> None:
+        if self._reads_in_flight.get(field) is read:
+            del self._reads_in_flight[field]
+        if not read.cancelled():
+            # Retrieve the exception so it is not reported when all callers are gone
+            read.exception()
+
+    async def snapshot(
+        self,
+        fields: Iterable[str] = QUERIES,
+        *,
+        timeout: float | None = None,
+        priority: Priority = Priority.BACKGROUND,
+        max_age: float | None = None,
+    ) -> Snapshot:
+        """
+        Read multiple fields in one batch.
+
+        All queries are sent back-to-back, with a `window` > 1 they are outstanding
+        at the same time instead of waiting for each other. Fields with a cached value
+        that is fresh enough are not queried and queries already in flight are merged.
+        """
+        await self._ready.wait()
+        snapshot = Snapshot()
+        queries = []
+        for field in fields:
+            if (cached := self._from_cache(field, max_age)) is not None:
+                setattr(snapshot, field, FieldResult(FieldStatus.OK, cached.value))
+            else:
+                queries.append(field)
+
+        results = await asyncio.gather(*(self._read(field, timeout, priority) for field in queries))
+
+        for field, (frame, response) in zip(queries, results):
+            if frame is None:
+                result: FieldResult = FieldResult(FieldStatus.TIMEOUT)
+            elif response is None:
+                result = FieldResult(FieldStatus.NG)
+            else:
+                result = FieldResult(FieldStatus.OK, QUERIES[field].decode(response))
+            setattr(snapshot, field, result)
+        return snapshot
+
+    async def _set_coalesced(
+        self, command1: str, command2: str, value: int, timeout: float | None, force: bool
+    ) -> None:
+        """
+        Set a value where only the last written value matters, like volume.
+
+        While a value is being written newer values are collected and only the newest
+        gets written after it, e.g. dragging a slider. All callers return once the
+        final value has been written.
+        """
+        key = (command1, command2)
+        if key in self._writes_in_progress:
+            if (write := self._next_writes.get(key)) is None:
+                write = self._next_writes[key] = _CoalescedWrite(
+                    value, force, asyncio.get_running_loop().create_future()
+                )
+            else:
+                write.value = value
+                write.force = write.force or force
+                self.coalesced_writes += 1
+            await asyncio.shield(write.future)
+            return
+
+        self._writes_in_progress.add(key)
+        write = None
+        try:
+            await self._set(command1, command2, value, timeout, force)
+            while (write := self._next_writes.pop(key, None)) is not None:
+                await self._set(command1, command2, write.value, timeout, write.force)
+                write.future.set_result(None)
+        except BaseException as e:
+            # Callers waiting for a newer value get the same error
+            for failed in (write, self._next_writes.pop(key, None)):
+                if failed is None or failed.future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    failed.future.cancel()
+                else:
+                    failed.future.set_exception(e)
+            raise
+        finally:
+            self._writes_in_progress.discard(key)
+
+    @property
+    def queue_wait(self) -> dict[Priority, QueueWaitStats]:
+        """Time commands waited to be sent per priority."""
+        return self._pipeline.queue_wait if self._pipeline else {}
+
+    @property
+    def counters(self) -> PipelineCounters:
+        """How often the connection had to be resynchronised."""
+        return self._pipeline.counters if self._pipeline else PipelineCounters()
+
+    @property
+    def capture(self) -> WireCapture | None:
+        return self._bus.capture if self._bus else None
+
+    def start_capture(self, max_bytes: int = CAPTURE_MAX_BYTES) -> WireCapture:
+        """
+        Capture all traffic on the bus, including that of other TVs on it.
+
+        Starts over when already capturing.
+        """
+        if self._bus is None:
+            raise ConnectionError("Not connected")
+        capture = self._bus.capture = WireCapture(max_bytes)
+        return capture
+
+    def stop_capture(self) -> WireCapture | None:
+        """Returns what was captured."""
+        capture = self.capture
+        if self._bus:
+            self._bus.capture = None
+        return capture
+
+    def _stats_for(self, command1: str, command2: str) -> CommandStats:
+        if (stats := self._command_stats.get((command1, command2))) is None:
+            stats = self._command_stats[(command1, command2)] = CommandStats()
+        return stats
+
+    def stats(self) -> TvStats:
+        """What happened on the wire, e.g. to spot a slow serial gateway."""
+        pipeline = self._pipeline
+        return TvStats(
+            commands=dict(self._command_stats),
+            connection=self.connection_stats,
+            counters=self.counters,
+            queue_wait=self.queue_wait,
+            junk_bytes=pipeline.junk_bytes if pipeline else 0,
+        )
+
+    async def set_power_on(self, value: bool, *, timeout: float | None = None) -> None:
+        await self._do_command("k", "a", 1 if value else 0, timeout=timeout)
+
+    async def get_power_on(self, *, timeout: float | None = None, max_age: float | None = None) -> bool | None:
+        return await self._query("power_on", timeout=timeout, max_age=max_age)
+
+    async def set_mute(self, mute: bool, *, timeout: float | None = None, force: bool = False) -> None:
+        await self._set("k", "e", 0 if mute else 1, timeout, force)
+
+    async def get_mute(self, *, timeout: float | None = None, max_age: float | None = None) -> bool | None:
+        return await self._query("mute", timeout=timeout, max_age=max_age)
+
+    async def set_volume(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("k", "f", value)
+        await self._set_coalesced("k", "f", value, timeout, force)
 
-    async def get_volume(self) -> int | None:
-        response = await self._do_command("k", "f", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_volume(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("volume", timeout=timeout, max_age=max_age)
 
-    async def remote_key(self, code: RemoteKeyCode) -> None:
+    async def remote_key(self, code: RemoteKeyCode, *, timeout: float | None = None) -> None:
         """Allows sending remote key codes"""
-        await self._do_command("m", "c", code)
+        await self._do_command("m", "c", code, timeout=timeout)
 
-    async def set_contrast(self, value: int) -> None:
+    async def set_contrast(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("k", "g", value)
+        await self._set_coalesced("k", "g", value, timeout, force)
 
-    async def get_contrast(self) -> int | None:
-        response = await self._do_command("k", "g", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_contrast(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("contrast", timeout=timeout, max_age=max_age)
 
-    async def set_brightness(self, value: int) -> None:
+    async def set_brightness(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("k", "h", value)
+        await self._set_coalesced("k", "h", value, timeout, force)
 
-    async def get_brightness(self) -> int | None:
-        response = await self._do_command("k", "h", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_brightness(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("brightness", timeout=timeout, max_age=max_age)
 
-    async def set_color(self, value: int) -> None:
+    async def set_color(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("k", "i", value)
+        await self._set_coalesced("k", "i", value, timeout, force)
 
-    async def get_color(self) -> int | None:
-        response = await self._do_command("k", "i", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_color(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("color", timeout=timeout, max_age=max_age)
 
-    async def set_sharpness(self, value: int) -> None:
+    async def set_sharpness(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("k", "k", value)
+        await self._set_coalesced("k", "k", value, timeout, force)
 
-    async def get_sharpness(self) -> int | None:
-        response = await self._do_command("k", "k", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_sharpness(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("sharpness", timeout=timeout, max_age=max_age)
 
-    async def set_remote_control_lock(self, value: bool) -> None:
-        await self._do_command("k", "m", 1 if value else 0)
+    async def set_remote_control_lock(self, value: bool, *, timeout: float | None = None, force: bool = False) -> None:
+        await self._set("k", "m", 1 if value else 0, timeout, force)
 
-    async def get_remote_control_lock(self) -> bool | None:
-        response = await self._do_command("k", "m", 0xFF)
-        if response and response.status_ok:
-            return response.data0 == 1
-        return None
+    async def get_remote_control_lock(self, *, timeout: float | None = None, max_age: float | None = None) -> bool | None:
+        return await self._query("remote_control_lock", timeout=timeout, max_age=max_age)
 
-    async def set_treble(self, value: int) -> None:
+    async def set_treble(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("k", "r", value)
+        await self._set_coalesced("k", "r", value, timeout, force)
 
-    async def get_treble(self) -> int | None:
-        response = await self._do_command("k", "r", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_treble(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("treble", timeout=timeout, max_age=max_age)
 
-    async def set_bass(self, value: int) -> None:
+    async def set_bass(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("k", "s", value)
+        await self._set_coalesced("k", "s", value, timeout, force)
 
-    async def get_bass(self) -> int | None:
-        response = await self._do_command("k", "s", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_bass(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("bass", timeout=timeout, max_age=max_age)
 
-    async def set_balance(self, value: int) -> None:
+    async def set_balance(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("k", "t", value)
+        await self._set_coalesced("k", "t", value, timeout, force)
 
-    async def get_balance(self) -> int | None:
-        response = await self._do_command("k", "t", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_balance(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("balance", timeout=timeout, max_age=max_age)
 
-    async def set_color_temperature(self, value: int) -> None:
+    async def set_color_temperature(self, value: int, *, timeout: float | None = None, force: bool = False) -> None:
         assert value >= 0
         assert value <= 100
-        await self._do_command("x", "u", value)
+        await self._set_coalesced("x", "u", value, timeout, force)
 
-    async def get_color_temperature(self) -> int | None:
-        response = await self._do_command("x", "u", 0xFF)
-        if response and response.status_ok:
-            return response.data0
-        return None
+    async def get_color_temperature(self, *, timeout: float | None = None, max_age: float | None = None) -> int | None:
+        return await self._query("color_temperature", timeout=timeout, max_age=max_age)
 
-    async def set_input(self, value: Input) -> None:
-        await self._do_command("x", "b", value)
+    async def set_input(self, value: Input, *, timeout: float | None = None, force: bool = False) -> None:
+        await self._set("x", "b", value, timeout, force)
 
-    async def get_input(self) -> Input | None:
-        response = await self._do_command("x", "b", 0xFF)
-        if response and response.status_ok:
-            return Input(response.data0)
-        return None
+    async def get_input(self, *, timeout: float | None = None, max_age: float | None = None) -> Input | None:
+        return await self._query("input", timeout=timeout, max_age=max_age)
 
     async def set_3d(
-        self, mode: Mode3D, encoding: Encoding3D, right_to_left: bool, depth: int
+        self, mode: Mode3D, encoding: Encoding3D, right_to_left: bool, depth: int, *, timeout: float | None = None
     ) -> None:
         await self._do_command(
-            "x", "t", mode, encoding, 1 if right_to_left else 0, depth
+            "x", "t", mode, encoding, 1 if right_to_left else 0, depth, timeout=timeout
         )
 
     # Does not seem to work even though my TV supports 3D
-    # async def get_3d(self) -> Config3D | None:
-    #     response = await self._do_command("x", "t", 0xFF)
+    # async def get_3d(self, *, timeout: float | None = None) -> Config3D | None:
+    #     response = await self._do_command("x", "t", 0xFF, timeout=timeout)
     #     if response and response.status_ok:
     #       return Config3D(Mode3D(response.data0), Encoding3D(response.data1), response.data2==1, response.data3)
     #     return None
 
-    async def set_energy_saving(self, value: EnergySaving) -> None:
-        await self._do_command("j", "q", value)
+    async def set_energy_saving(self, value: EnergySaving, *, timeout: float | None = None, force: bool = False) -> None:
+        await self._set("j", "q", value, timeout, force)
 
-    async def get_energy_saving(self) -> EnergySaving | None:
-        response = await self._do_command("j", "q", 0xFF)
-        if response and response.status_ok:
-            return EnergySaving(response.data0)
-        return None
+    async def get_energy_saving(self, *, timeout: float | None = None, max_age: float | None = None) -> EnergySaving | None:
+        return await self._query("energy_saving", timeout=timeout, max_age=max_age)
 
     async def send_raw(
-        self, command1: str, command2: str, data: list[int | None]
+        self, command1: str, command2: str, data: list[int | None], *, timeout: float | None = None
     ) -> None:
         data = list(data)  # Copy list to avoid modifying the original
 
@@ -549,10 +2118,124 @@ class LgTv:
             data.append(None)
 
         await self._do_command(
-            command1, command2, data[0], data[1], data[2], data[3], data[4], data[5]
+            command1, command2, data[0], data[1], data[2], data[3], data[4], data[5], timeout=timeout
         )
 
 
+class TvGroup:
+    """
+    Send the same command to multiple TVs at once, e.g. switch off all TVs in a zone.
+
+    TVs on a bus get one broadcast frame (set ID 0) when the group contains all TVs
+    using that bus, otherwise they get a frame per set ID. Note that a broadcast is
+    handled by every TV on the line, also TVs that are not known to the bus.
+    Frames are sent concurrently and the responses are collected as they arrive.
+    """
+
+    def __init__(self, tvs: Iterable[LgTv]) -> None:
+        self._tvs = list(dict.fromkeys(tvs))
+
+    async def send(
+        self,
+        command1: str,
+        command2: str,
+        data0: int,
+        data1: int | None = None,
+        data2: int | None = None,
+        data3: int | None = None,
+        data4: int | None = None,
+        data5: int | None = None,
+        *,
+        confirm: bool = True,
+        timeout: float | None = None,
+    ) -> dict[LgTv, Response | None]:
+        """
+        Returns the response per TV, None when a TV did not respond or responded NG.
+
+        With `confirm` False it returns as soon as all frames are sent without responses.
+        """
+        tvs_per_bus: dict[SerialBus, list[LgTv]] = {}
+        for tv in self._tvs:
+            if tv._bus is None:
+                raise ConnectionError("Not connected")
+            tvs_per_bus.setdefault(tv._bus, []).append(tv)
+
+        frames: list[tuple[SerialBus, int, list[LgTv]]] = []
+        for bus, tvs in tvs_per_bus.items():
+            if (
+                len(tvs) > 1
+                and bus.handles == set(tvs)
+                and all(tv.set_id != BROADCAST_SET_ID for tv in tvs)
+            ):
+                frames.append((bus, BROADCAST_SET_ID, tvs))
+            else:
+                frames.extend((bus, tv.set_id, [tv]) for tv in tvs)
+
+        results = await asyncio.gather(
+            *(
+                self._send_frame(
+                    bus,
+                    build_command(command1, command2, set_id, data0, data1, data2, data3, data4, data5),
+                    command1,
+                    command2,
+                    tvs,
+                    confirm,
+                    timeout,
+                )
+                for bus, set_id, tvs in frames
+            )
+        )
+        responses = {}
+        for result in results:
+            for tv, frame in result.items():
+                responses[tv] = parse_response(frame) if frame else None
+                if frame and responses[tv] is None:
+                    tv._stats_for(command1, command2).ng += 1
+                if not confirm:
+                    # Unknown what the TV did with it, so nothing cached can be trusted
+                    tv._cache.clear()
+                    continue
+                tv._update_cache(command1, command2, data0, responses[tv])
+                if (command1, command2) == ("k", "a"):
+                    tv._update_power_state(data0, frame, responses[tv])
+        return responses
+
+    @staticmethod
+    async def _send_frame(
+        bus: SerialBus,
+        command: bytes,
+        command1: str,
+        command2: str,
+        tvs: list[LgTv],
+        confirm: bool,
+        timeout: float | None,
+    ) -> dict[LgTv, bytes | None]:
+        if (pipeline := bus.pipeline) is None:
+            raise ConnectionError("Not connected")
+        stats = {tv.set_id: tv._stats_for(command1, command2) for tv in tvs}
+        try:
+            frames = await pipeline.execute_many(
+                command, command2, [tv.set_id for tv in tvs], timeout, wait=confirm, stats=stats
+            )
+        except (ConnectionError, SerialException, OSError) as e:
+            logger.warning("Connection error", exc_info=True)
+            await bus.connection_lost()
+            raise ConnectionError("Serial connection error") from e
+
+        if confirm:
+            for tv in tvs:
+                # Like single commands, a booting TV not responding is expected
+                if frames.get(tv.set_id) is None and tv.power_state is not PowerState.BOOTING:
+                    stats[tv.set_id].timeouts += 1
+        return {tv: frames.get(tv.set_id) for tv in tvs}
+
+    async def set_power_on(self, value: bool, *, confirm: bool = True) -> dict[LgTv, Response | None]:
+        return await self.send("k", "a", 1 if value else 0, confirm=confirm)
+
+    async def set_input(self, value: Input, *, confirm: bool = True) -> dict[LgTv, Response | None]:
+        return await self.send("x", "b", value, confirm=confirm)
+
+
 async def main(serial_url: str, set_id: int, rtscts: bool, dsrdtr: bool):
     async with LgTv(serial_url, set_id, rtscts, dsrdtr) as tv:
         await tv.connect()
@@ -562,27 +2245,12 @@ async def main(serial_url: str, set_id: int, rtscts: bool, dsrdtr: bool):
         print(f"await tv.get_power_on()={power_state}")
         print("--- Power on TV")
         await tv.set_power_on(True)
-        wait = 10
-        print("--- Wait {wait} seconds to let the TV power on and be ready for commands".format(wait=wait))
-        for i in range(wait-1, -1, -1):
-            print(f"\r{i} ", end="", flush=True)
-            await asyncio.sleep(1)
-        print()
+        print("--- Wait for the TV to be ready for commands")
+        print(f"await tv.wait_until_ready()={await tv.wait_until_ready(BOOT_TIMEOUT)}")
         print("--- Get all values")
-        print(f"{await tv.get_power_on()=}")
-        print(f"{await tv.get_input()=}")
-        print(f"{await tv.get_volume()=}")
-        print(f"{await tv.get_mute()=}")
-        print(f"{await tv.get_treble()=}")
-        print(f"{await tv.get_bass()=}")
-        print(f"{await tv.get_balance()=}")
-        print(f"{await tv.get_brightness()=}")
-        print(f"{await tv.get_contrast()=}")
-        print(f"{await tv.get_color()=}")
-        print(f"{await tv.get_color_temperature()=}")
-        print(f"{await tv.get_sharpness()=}")
-        print(f"{await tv.get_remote_control_lock()=}")
-        print(f"{await tv.get_energy_saving()=}")
+        snapshot = await tv.snapshot()
+        for field in dataclass_fields(snapshot):
+            print(f"{field.name}={getattr(snapshot, field.name)}")
         # print(f"{await tv.get_3d()=}")
 
         # await tv.send_raw("k", "e", "01")
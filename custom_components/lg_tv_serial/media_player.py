@@ -64,6 +64,9 @@ class LgTvMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
     _attr_has_entity_name = True
     _attr_device_class = MediaPlayerDeviceClass.TV
 
+    # Fields of CoordinatorData the entity uses, only those get polled
+    _data_fields = ("volume", "mute", "input")
+
     def __init__(self, coordinator: LgTvCoordinator, configentry_id: str) -> None:
         super().__init__(coordinator)
         self.coordinator: LgTvCoordinator
@@ -74,6 +77,11 @@ class LgTvMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             identifiers={(DOMAIN, configentry_id)},
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the fields the entity uses."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_subscribe_fields(self._data_fields))
+
     @property
     def supported_features(self):
         """Flag of media commands that are supported."""
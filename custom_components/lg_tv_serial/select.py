@@ -14,6 +14,8 @@ from .lgtv_api import EnergySaving, LgTv
 
 @dataclass(frozen=True, kw_only=True)
 class LgTvSelectEntityDescription(SelectEntityDescription):
+    data_fields: tuple[str, ...] = ()
+    """Fields of CoordinatorData the entity uses, only those get polled"""
     is_supported: Callable[[LgTv, CoordinatorData], bool] = lambda api, data: True
     is_available: Callable[[LgTv, CoordinatorData], bool] = lambda api, data: True
     select_option_fn: Callable[[LgTv, str], Coroutine] = None  # type: ignore[assignment]
@@ -34,6 +36,7 @@ ENTITY_DESCRIPTIONS = [
         key="energy_saving",  # type: ignore
         icon="mdi:leaf",  # type: ignore
         entity_category=EntityCategory.CONFIG,
+        data_fields=("energy_saving",),
         options = [slugify(e.name) for e in EnergySaving],
         is_available=lambda api, coordinator_data: coordinator_data.energy_saving is not None and coordinator_data.power_on is True,
         select_option_fn = select_energy_saving
@@ -76,6 +79,13 @@ class LgTvSelect(CoordinatorEntity, SelectEntity):
             identifiers={(DOMAIN, configentry_id)},
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the fields the entity uses."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_subscribe_fields(self.entity_description.data_fields)
+        )
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
@@ -89,4 +99,5 @@ class LgTvSelect(CoordinatorEntity, SelectEntity):
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         await self.entity_description.select_option_fn(self.coordinator.api, option)
+        self.coordinator.mark_active()
         await self.coordinator.async_request_refresh()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import datetime
+from typing import Callable
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import UnitOfInformation, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.entity import EntityCategory, DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DEFAULT_DEVICE_NAME, DOMAIN
+from .coordinator import LgTvCoordinator
+
+
+# Statistics change without the coordinator data changing, so they are refreshed periodically
+STATISTICS_UPDATE_INTERVAL = datetime.timedelta(seconds=60)
+
+
+@dataclass(frozen=True, kw_only=True)
+class LgTvSensorEntityDescription(SensorEntityDescription):
+    value_fn: Callable[[LgTvCoordinator], StateType] = None  # type: ignore[assignment]
+
+
+def _total(coordinator: LgTvCoordinator, attribute: str) -> int:
+    return sum(getattr(stats, attribute) for stats in coordinator.api.stats().commands.values())
+
+
+def _average_response_time(coordinator: LgTvCoordinator) -> float | None:
+    if not (responses := _total(coordinator, "responses")):
+        return None
+    return round(
+        sum(stats.latency_total for stats in coordinator.api.stats().commands.values()) / responses * 1000,
+        1,
+    )
+
+
+ENTITY_DESCRIPTIONS = [
+    LgTvSensorEntityDescription(  # type: ignore
+        key="update_interval",  # type: ignore
+        icon="mdi:timer-sync-outline",  # type: ignore
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda coordinator: coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+    ),
+    LgTvSensorEntityDescription(  # type: ignore
+        key="response_time",  # type: ignore
+        icon="mdi:timer-outline",  # type: ignore
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=_average_response_time,
+    ),
+    LgTvSensorEntityDescription(  # type: ignore
+        key="timeouts",  # type: ignore
+        icon="mdi:timer-alert-outline",  # type: ignore
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: _total(coordinator, "timeouts"),
+    ),
+    LgTvSensorEntityDescription(  # type: ignore
+        key="ng_responses",  # type: ignore
+        icon="mdi:alert-circle-outline",  # type: ignore
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _total(coordinator, "ng"),
+    ),
+    LgTvSensorEntityDescription(  # type: ignore
+        key="junk_bytes",  # type: ignore
+        icon="mdi:delete-outline",  # type: ignore
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.api.stats().junk_bytes,
+    ),
+    LgTvSensorEntityDescription(  # type: ignore
+        key="reconnects",  # type: ignore
+        icon="mdi:connection",  # type: ignore
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.api.connection_stats.reconnects,
+    ),
+]
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+
+    coordinator: LgTvCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_entities(
+        [
+            LgTvSensor(config_entry.entry_id, coordinator, entity_description)
+            for entity_description in ENTITY_DESCRIPTIONS
+        ]
+    )
+
+
+class LgTvSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a sensor on a LG TV."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        configentry_id: str,
+        coordinator: LgTvCoordinator,
+        entity_description: LgTvSensorEntityDescription,
+    ):
+        super().__init__(coordinator)
+        self.coordinator: LgTvCoordinator
+
+        self.entity_description: LgTvSensorEntityDescription = entity_description
+        self._attr_translation_key = self.entity_description.key
+
+        self._attr_unique_id = f"{configentry_id}_sensor_{self.entity_description.key}"
+
+        self._attr_device_info = DeviceInfo(
+            name=DEFAULT_DEVICE_NAME,  # API does not expose a name. Pick a decent default, user can change
+            identifiers={(DOMAIN, configentry_id)},
+        )
+
+    @property
+    def available(self) -> bool:
+        """Sensors about the connection are available regardless of the TV state."""
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_update_statistics, STATISTICS_UPDATE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_update_statistics(self, _now) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -16,6 +16,8 @@ from .lgtv_api import LgTv
 
 @dataclass(frozen=True, kw_only=True)
 class LgTvSwitchEntityDescription(SwitchEntityDescription):
+    data_fields: tuple[str, ...] = ()
+    """Fields of CoordinatorData the entity uses, only those get polled"""
     is_on: Callable[[CoordinatorData], bool | None] = None  # type: ignore[assignment]
     turn_on: Callable[[LgTv, CoordinatorData], Coroutine] = None  # type: ignore[assignment]
     turn_off: Callable[[LgTv, CoordinatorData], Coroutine] = None  # type: ignore[assignment]
@@ -33,6 +35,7 @@ ENTITY_DESCRIPTIONS = [
         key="remote_control_lock",  # type: ignore
         icon="mdi:monitor-lock",  # type: ignore
         entity_category=EntityCategory.CONFIG,  # type: ignore
+        data_fields=("remote_control_lock",),
         is_on=lambda coordinator_data: coordinator_data.remote_control_lock,
         turn_on=lambda api, data: set_remote_control_lock(api, data, True),
         turn_off=lambda api, data: set_remote_control_lock(api, data, False),
@@ -64,6 +67,7 @@ class LgTvSwitch(CoordinatorEntity, SwitchEntity):
         entity_description: LgTvSwitchEntityDescription,
     ):
         super().__init__(coordinator)
+        self.coordinator: LgTvCoordinator
 
         self.entity_description: LgTvSwitchEntityDescription = entity_description
         self._attr_translation_key = self.entity_description.key
@@ -75,6 +79,13 @@ class LgTvSwitch(CoordinatorEntity, SwitchEntity):
             identifiers={(DOMAIN, configentry_id)},
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the fields the entity uses."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_subscribe_fields(self.entity_description.data_fields)
+        )
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
@@ -88,9 +99,11 @@ class LgTvSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
         await self.entity_description.turn_on(self.coordinator.api, self.coordinator.data)
+        self.coordinator.mark_active()
         self.async_write_ha_state()        
 
     async def async_turn_off(self, **kwargs: Any):
         """Turn the entity off."""
         await self.entity_description.turn_off(self.coordinator.api, self.coordinator.data)
+        self.coordinator.mark_active()
         self.async_write_ha_state()
\ No newline at end of file
@@ -134,6 +134,7 @@ class TvState:
     total_commands_received: int = 0  # Commands received from socket
     show_help: bool = False
     power_on_time: float | None = None  # Timestamp when power-on was initiated
+    response_delay: float = 0.0  # Seconds the second half of a response is held back
     active_clients: set[asyncio.StreamWriter] = field(default_factory=set)
     client_tasks: set[asyncio.Task[None]] = field(default_factory=set)
 
@@ -480,6 +481,13 @@ async def _handle_client(
                 response = _dispatch_command(state, cmd1, cmd2, data, configured_set_id)
                 # Skip sending if no response (e.g., during boot delay)
                 if response is not None:
+                    if state.response_delay:
+                        # Simulate a slow line, the response arrives in parts
+                        half = len(response) // 2
+                        writer.write(response[:half])
+                        await writer.drain()
+                        await asyncio.sleep(state.response_delay)
+                        response = response[half:]
                     writer.write(response)
                     await writer.drain()
                 state.total_commands_received += 1
@@ -883,9 +891,14 @@ def main() -> None:
         choices=range(1, 100), metavar="ID",
         help="Set ID to emulate (1–99, default: 1)",
     )
+    parser.add_argument(
+        "--response-delay", type=float, default=0.0, dest="response_delay",
+        metavar="SECONDS",
+        help="Hold back the second half of each response (default: 0)",
+    )
     args = parser.parse_args()
 
-    state = TvState()
+    state = TvState(response_delay=args.response_delay)
 
     # Initialise curses manually so we can pass stdscr into asyncio.run()
     stdscr = curses.initscr()
@@ -4,17 +4,23 @@ from __future__ import annotations
 
 from unittest.mock import AsyncMock, patch
 
-from homeassistant.config_entries import SOURCE_RECONFIGURE
+from homeassistant.config_entries import SOURCE_RECONFIGURE, SOURCE_USER
 from homeassistant.data_entry_flow import FlowResultType
 from pytest_homeassistant_custom_component.common import MockConfigEntry  # type: ignore[import-untyped]
 
 from custom_components.lg_tv_serial.const import (
+    DEFAULT_POLL_PERIOD,
     DOMAIN,
     DSRDTR,
+    MAX_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    POLL_PERIOD_OPTIONS,
     RTSCTS,
     SERIAL_URL,
     SET_ID,
 )
+from custom_components.lg_tv_serial.helpers import async_take_api
+from custom_components.lg_tv_serial.lgtv_api import PowerState
 
 
 def _make_entry() -> MockConfigEntry:
@@ -31,6 +37,29 @@ def _make_entry() -> MockConfigEntry:
     )
 
 
+async def test_user_step_hands_off_connection(hass, mock_setup_entry) -> None:
+    """The connection that was validated is kept for setting up the entry."""
+    flow = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
+
+    mock_api = AsyncMock()
+    mock_api.power_state = PowerState.ON
+
+    with patch(
+        "custom_components.lg_tv_serial.helpers.LgTv",
+        return_value=mock_api,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            flow["flow_id"],
+            user_input={SERIAL_URL: "/dev/ttyUSB0", SET_ID: 1, RTSCTS: False, DSRDTR: False},
+        )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    mock_api.connect.assert_awaited_once()
+    mock_api.close.assert_not_awaited()
+    assert async_take_api(hass, "/dev/ttyUSB0", 1) is mock_api
+    assert async_take_api(hass, "/dev/ttyUSB0", 1) is None
+
+
 async def test_reconfigure_updates_entry_and_reloads(hass, mock_setup_entry) -> None:
     """Reconfigure flow updates the entry and schedules a reload."""
     entry = _make_entry()
@@ -58,7 +87,7 @@ async def test_reconfigure_updates_entry_and_reloads(hass, mock_setup_entry) ->
 
     with (
         patch(
-            "custom_components.lg_tv_serial.config_flow.LgTv",
+            "custom_components.lg_tv_serial.helpers.LgTv",
             return_value=mock_api,
         ),
         patch.object(hass.config_entries, "async_schedule_reload") as mock_reload,
@@ -71,6 +100,9 @@ async def test_reconfigure_updates_entry_and_reloads(hass, mock_setup_entry) ->
     assert result["reason"] == "reconfigure_successful"
     assert entry.data == new_data
     mock_reload.assert_called_once_with(entry.entry_id)
+    # Setting up the entry again has to use the new settings, not the validated connection
+    mock_api.close.assert_awaited_once()
+    assert async_take_api(hass, "/dev/ttyUSB1", 5) is None
 
 
 async def test_reconfigure_shows_connection_error(hass, mock_setup_entry) -> None:
@@ -91,7 +123,7 @@ async def test_reconfigure_shows_connection_error(hass, mock_setup_entry) -> Non
     mock_api.connect.side_effect = ConnectionError("boom")
 
     with patch(
-        "custom_components.lg_tv_serial.config_flow.LgTv",
+        "custom_components.lg_tv_serial.helpers.LgTv",
         return_value=mock_api,
     ):
         result = await hass.config_entries.flow.async_configure(
@@ -107,3 +139,39 @@ async def test_reconfigure_shows_connection_error(hass, mock_setup_entry) -> Non
     assert result["type"] == FlowResultType.FORM
     assert result["step_id"] == "reconfigure"
     assert result["errors"] == {"base": "cannot_connect"}
+
+
+async def test_options_flow_sets_polling_schedule(hass, mock_setup_entry) -> None:
+    """Options flow stores how often each field is read."""
+    entry = _make_entry()
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    options = {POLL_PERIOD_OPTIONS[field]: default for field, default in DEFAULT_POLL_PERIOD.items()}
+    options[POLL_PERIOD_OPTIONS["input"]] = 120
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=options
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[POLL_PERIOD_OPTIONS["input"]] == 120
+
+
+async def test_options_flow_rejects_inverted_interval_bounds(hass, mock_setup_entry) -> None:
+    """Fastest update interval can not be slower than the slowest one."""
+    entry = _make_entry()
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={MIN_UPDATE_INTERVAL: 60, MAX_UPDATE_INTERVAL: 10},
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_interval_bounds"}
@@ -0,0 +1,145 @@
+"""Test the LG TV Serial coordinator."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # type: ignore[import-untyped]
+
+from custom_components.lg_tv_serial.const import DOMAIN, SERIAL_URL, SET_ID
+from custom_components.lg_tv_serial.coordinator import STATUS_FIELDS, LgTvCoordinator
+from custom_components.lg_tv_serial.lgtv_api import (
+    ConnectionStats,
+    EnergySaving,
+    FieldResult,
+    FieldStatus,
+    Input,
+    PowerState,
+    Snapshot,
+)
+
+
+class FakeApi:
+    """Answers with `values` and keeps track of the fields that were read."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {
+            "power_on": True,
+            "volume": 10,
+            "mute": False,
+            "input": Input.HDMI1,
+            "remote_control_lock": False,
+            "energy_saving": EnergySaving.OFF,
+        }
+        self.reads: list[str] = []
+        self.power_state = PowerState.ON
+        self.connection_stats = ConnectionStats()
+
+    async def get_power_on(self, *, timeout: float | None = None, max_age: float | None = None) -> bool:
+        self.reads.append("power_on")
+        return self.values["power_on"]
+
+    async def snapshot(self, fields: Iterable[str], **kwargs: Any) -> Snapshot:
+        snapshot = Snapshot()
+        for field in fields:
+            self.reads.append(field)
+            setattr(snapshot, field, FieldResult(FieldStatus.OK, self.values[field]))
+        return snapshot
+
+
+def _make_coordinator(hass) -> tuple[LgTvCoordinator, FakeApi]:
+    entry = MockConfigEntry(domain=DOMAIN, data={SERIAL_URL: "/dev/ttyUSB0", SET_ID: 1})
+    entry.add_to_hass(hass)
+    api = FakeApi()
+    return LgTvCoordinator(hass, entry, api), api  # type: ignore[arg-type]
+
+
+async def test_fields_are_read_on_their_own_schedule(hass) -> None:
+    """Fields that rarely change are read when their period in seconds has passed."""
+    coordinator, api = _make_coordinator(hass)
+    coordinator.async_subscribe_fields(STATUS_FIELDS)
+
+    await coordinator.async_refresh()
+    assert set(api.reads) == {"power_on", *STATUS_FIELDS}
+
+    api.reads.clear()
+    await coordinator.async_refresh()
+    assert set(api.reads) == {"power_on", "volume", "mute"}
+
+    # Input is read every 30 seconds by default, no matter how many updates happened
+    coordinator._last_read["input"] -= 30
+    api.reads.clear()
+    await coordinator.async_refresh()
+    assert set(api.reads) == {"power_on", "volume", "mute", "input"}
+
+    await coordinator.async_shutdown()
+
+
+async def test_only_subscribed_fields_are_polled(hass) -> None:
+    """Status fields are only read while something uses them, power is always read."""
+    coordinator, api = _make_coordinator(hass)
+
+    await coordinator.async_refresh()
+    assert api.reads == ["power_on"]
+
+    unsubscribe = coordinator.async_subscribe_fields(["volume", "mute"])
+    api.reads.clear()
+    await coordinator.async_refresh()
+    assert set(api.reads) == {"power_on", "volume", "mute"}
+
+    unsubscribe()
+    assert coordinator.subscribed_fields == set()
+    api.reads.clear()
+    await coordinator.async_refresh()
+    assert api.reads == ["power_on"]
+
+    await coordinator.async_shutdown()
+
+
+async def test_subscriptions_are_counted(hass) -> None:
+    """A field keeps being polled until the last user unsubscribes."""
+    coordinator, api = _make_coordinator(hass)
+    unsubscribe_1 = coordinator.async_subscribe_fields(["volume"])
+    unsubscribe_2 = coordinator.async_subscribe_fields(["volume"])
+
+    unsubscribe_1()
+    api.reads.clear()
+    await coordinator.async_refresh()
+    assert "volume" in api.reads
+
+    unsubscribe_2()
+    api.reads.clear()
+    await coordinator.async_refresh()
+    assert "volume" not in api.reads
+
+    await coordinator.async_shutdown()
+
+
+async def test_listeners_are_only_called_on_changes(hass) -> None:
+    """Listeners are not woken up by updates that did not change anything."""
+    coordinator, api = _make_coordinator(hass)
+    coordinator.async_subscribe_fields(["volume", "mute"])
+    calls = []
+    unsubscribe = coordinator.async_add_listener(lambda: calls.append(set(coordinator.changed_fields)))
+
+    await coordinator.async_refresh()
+    assert len(calls) == 1
+
+    # Backing off changes the interval, which alone is no reason to wake up the listeners
+    coordinator._fast_until = 0
+    coordinator.update_interval = coordinator.min_interval
+    calls.clear()
+    await coordinator.async_refresh()
+    assert coordinator.update_interval != coordinator.min_interval
+    assert calls == []
+    assert coordinator.changed_fields == set()
+
+    api.values["volume"] = 20
+    api.values["mute"] = True
+    await coordinator.async_refresh()
+    assert calls == [{"volume", "mute"}]
+    assert coordinator.data.volume == 20
+
+    unsubscribe()
+    await coordinator.async_shutdown()
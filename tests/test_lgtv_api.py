@@ -0,0 +1,990 @@
+"""Test the LG TV API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+import json
+import re
+
+from hypothesis import given, strategies as st
+import pytest
+import serialx
+
+import lgtv_emulator
+from custom_components.lg_tv_serial import lgtv_api
+from custom_components.lg_tv_serial.lgtv_api import (
+    FRAME_BYTES,
+    RESYNC_QUIET_TIME,
+    CaptureRecord,
+    CommandDropped,
+    CommandPipeline,
+    CommandStats,
+    FieldResult,
+    FieldStatus,
+    FrameDecoder,
+    FrameEncoder,
+    Input,
+    LgTv,
+    PipelineCounters,
+    PowerState,
+    Priority,
+    RemoteKeyCode,
+    ReplayTransport,
+    Response,
+    RttEstimator,
+    SerialBus,
+    TvGroup,
+    build_command,
+    parse_response,
+)
+
+
+@pytest.fixture
+async def emulator() -> AsyncGenerator[tuple[lgtv_emulator.TvState, str], None]:
+    """Run the emulator with set ID 1, yields its state and serial url."""
+    state = lgtv_emulator.TvState(power=True)
+    server = await asyncio.start_server(
+        lambda r, w: lgtv_emulator._handle_client(r, w, state, 1), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    yield state, f"socket://127.0.0.1:{port}"
+    for task in list(state.client_tasks):
+        task.cancel()
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.fixture
+async def chain(request) -> AsyncGenerator[tuple[dict[int, lgtv_emulator.TvState], str, list[bytes]], None]:
+    """
+    Run emulated TVs on one line, yields their states, serial url and received frames.
+
+    The TVs have set ID 1 and 2 unless other set IDs are passed with indirect parametrization.
+    """
+    states = {set_id: lgtv_emulator.TvState(power=True) for set_id in getattr(request, "param", (1, 2))}
+    received: list[bytes] = []
+
+    async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        decoder = FrameDecoder(end_marker=b"\r")
+        while data := await reader.read(256):
+            decoder.feed(data)
+            while (frame := decoder.next_frame()) is not None:
+                received.append(frame)
+                if (command := lgtv_emulator.parse_command(frame.decode())) is None:
+                    continue
+                cmd1, cmd2, set_id, values = command
+                for tv_set_id, state in states.items():
+                    if set_id in (0, tv_set_id):
+                        response = lgtv_emulator._dispatch_command(state, cmd1, cmd2, values, tv_set_id)
+                        if response is not None:
+                            writer.write(response)
+        writer.close()
+
+    server = await asyncio.start_server(handle_client, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield states, f"socket://127.0.0.1:{port}", received
+    server.close()
+
+
+class FakeWriter:
+    """Collects written data instead of sending it."""
+
+    def __init__(self) -> None:
+        self.written = bytearray()
+
+    def write(self, data: bytes) -> None:
+        self.written += data
+
+    async def drain(self) -> None:
+        pass
+
+
+def test_frame_decoder_splits_frames() -> None:
+    """Multiple frames in one chunk and frames spread over chunks are split."""
+    decoder = FrameDecoder()
+
+    decoder.feed(b"a 01 OK01xf 01 OK")
+    assert decoder.next_frame() == b"a 01 OK01"
+    assert decoder.next_frame() is None
+
+    decoder.feed(b"10x")
+    assert decoder.next_frame() == b"f 01 OK10"
+    assert decoder.next_frame() is None
+
+
+def test_frame_decoder_drops_junk() -> None:
+    """Junk bytes are dropped and counted, empty frames are skipped."""
+    decoder = FrameDecoder()
+
+    decoder.feed(b"\xff\xffa 01 \r\nOK01x\xffx")
+    assert decoder.next_frame() == b"a 01 OK01"
+    assert decoder.next_frame() is None
+    assert decoder.junk_bytes == 5
+
+
+def test_frame_decoder_custom_end_marker() -> None:
+    """The end marker is configurable, e.g. for commands sent to the TV."""
+    decoder = FrameDecoder(end_marker=b"\r")
+
+    decoder.feed(b"ka 01 FF\rxb 01 90\r")
+    assert decoder.next_frame() == b"ka 01 FF"
+    assert decoder.next_frame() == b"xb 01 90"
+    assert decoder.next_frame() is None
+
+
+def test_frame_decoder_clear() -> None:
+    """Clearing drops incomplete and complete frames."""
+    decoder = FrameDecoder()
+
+    decoder.feed(b"a 01 OK01xf 01")
+    decoder.clear()
+    decoder.feed(b"e 01 OK00x")
+    assert decoder.next_frame() == b"e 01 OK00"
+    assert decoder.next_frame() is None
+
+
+@pytest.mark.parametrize(
+    ("command1", "command2", "data", "expected"),
+    [
+        ("k", "a", [0xFF], b"ka 0A FF\r"),
+        ("m", "c", [RemoteKeyCode.VOLUME_PLUS], b"mc 0A 02\r"),
+        ("k", "f", [0x20], b"kf 0A 20\r"),
+        ("x", "t", [0x00, 0x01, 0x00, 0x10], b"xt 0A 00 01 00 10\r"),
+        ("x", "t", [0x00, 0x01, None, 0x10], b"xt 0A 00 01\r"),
+    ],
+)
+def test_frame_encoder(command1, command2, data, expected) -> None:
+    """Encoded frames, cached or not, match build_command."""
+    encoder = FrameEncoder(10)
+
+    assert build_command(command1, command2, 10, *data) == expected
+    assert encoder.encode(command1, command2, *data) == expected
+    assert encoder.encode(command1, command2, *data) == expected
+
+
+def parse_response_original(reponse: bytes) -> Response | None:
+    """parse_response as it was before it was optimized, without logging, with hex set IDs."""
+    match = re.match(
+        r"(?P<cmd2>.) (?P<set_id>[0-9A-Fa-f]{2}) (?P<status>..)(?P<data>.+)",
+        reponse.decode("ascii"),
+    )
+    if match is None:
+        return None
+
+    if match.group("status") != "OK":
+        return None
+
+    data = match.group("data")
+    data_bytes = [int(data[i:i+2], 16) for i in range(0, min(len(data), 12), 2)]
+    return Response(match.group("cmd2"), int(match.group("set_id"), 16), True, *data_bytes)
+
+
+def assert_same_as_original(frame: bytes) -> None:
+    try:
+        expected = parse_response_original(frame)
+    except ValueError:
+        with pytest.raises(ValueError):
+            parse_response(frame)
+        return
+
+    assert parse_response(frame) == expected
+    assert parse_response(memoryview(frame)) == expected
+
+
+# Frames as they come out of the FrameDecoder
+frames = st.binary(max_size=24).map(lambda data: bytes(FRAME_BYTES[b % len(FRAME_BYTES)] for b in data))
+
+# Frames that look like responses
+hex_text = st.text(alphabet="0123456789ABCDEFabcdef ", max_size=16)
+response_frames = st.builds(
+    lambda cmd2, set_id, status, data: f"{cmd2} {set_id} {status}{data}".encode("ascii"),
+    st.sampled_from("abefmqtuxz "),
+    st.text(alphabet="0123456789AF", min_size=2, max_size=2),
+    st.sampled_from(["OK", "NG", "Ok", "  "]),
+    hex_text,
+)
+
+
+@given(frames)
+def test_parse_response_frames(frame: bytes) -> None:
+    """Parsing any frame gives the same result as the original parser."""
+    assert_same_as_original(frame)
+
+
+@given(response_frames)
+def test_parse_response_response_frames(frame: bytes) -> None:
+    """Parsing response-like frames gives the same result as the original parser."""
+    assert_same_as_original(frame)
+
+
+def test_parse_response() -> None:
+    """Responses with status OK are parsed, NG and garbage are not."""
+    assert parse_response(b"a 01 OK01") == Response("a", 1, True, 1)
+    assert parse_response(b"t 10 OK00011030") == Response("t", 0x10, True, 0, 1, 0x10, 0x30)
+    assert parse_response(b"a 0A OK01") == Response("a", 0x0A, True, 1)
+    assert parse_response(b"a 01 NG00") is None
+    assert parse_response(b"a 01 OK") is None
+    assert parse_response(b"garbage") is None
+    with pytest.raises(ValueError):
+        parse_response(b"a 01 OKzz")
+
+
+def test_rtt_estimator() -> None:
+    """Timeout follows the measured round trip times within the bounds."""
+    rtt = RttEstimator(minimum=0.5, maximum=5)
+    assert rtt.timeout == 5
+
+    for _ in range(20):
+        rtt.update(0.05)
+    assert rtt.timeout == 0.5
+
+    for _ in range(20):
+        rtt.update(0.4)
+    assert 0.5 < rtt.timeout < 5
+
+    # Timeouts back off until the next measurement
+    timeout = rtt.timeout
+    rtt.timed_out()
+    assert rtt.timeout == min(timeout * 2, 5)
+    rtt.update(0.4)
+    assert rtt.timeout <= timeout
+
+    rtt.update(100)
+    assert rtt.timeout == 5
+
+
+async def test_pipeline_matches_responses_in_order() -> None:
+    """Commands are written back-to-back and responses go to the right caller."""
+    reader = asyncio.StreamReader()
+    writer = FakeWriter()
+    pipeline = CommandPipeline(reader, writer, window=3)  # type: ignore[arg-type]
+    pipeline.start()
+
+    tasks = [
+        asyncio.create_task(pipeline.execute(b"ka 01 FF\r", "a", 1)),
+        asyncio.create_task(pipeline.execute(b"kf 01 FF\r", "f", 1)),
+        asyncio.create_task(pipeline.execute(b"ke 01 FF\r", "e", 1)),
+    ]
+    await asyncio.sleep(0.01)
+    assert writer.written == b"ka 01 FF\rkf 01 FF\rke 01 FF\r"
+
+    reader.feed_data(b"a 01 OK01xf 01 OK10xe 01 OK01x")
+    assert await asyncio.gather(*tasks) == [b"a 01 OK01", b"f 01 OK10", b"e 01 OK01"]
+
+    await pipeline.close()
+
+
+async def test_pipeline_rtt_excludes_queueing() -> None:
+    """Time spent waiting behind earlier commands is not counted as round trip time."""
+    reader = asyncio.StreamReader()
+    writer = FakeWriter()
+    pipeline = CommandPipeline(reader, writer, window=5)  # type: ignore[arg-type]
+    pipeline.start()
+
+    tasks = [
+        asyncio.create_task(pipeline.execute(f"k{command2} 01 FF\r".encode(), command2, 1))
+        for command2 in "afemn"
+    ]
+    # The TV takes 0.1 seconds per command
+    for command2 in "afemn":
+        await asyncio.sleep(0.1)
+        reader.feed_data(f"{command2} 01 OK01x".encode())
+    await asyncio.gather(*tasks)
+
+    assert pipeline.rtt.srtt is not None
+    assert pipeline.rtt.srtt < 0.15
+
+    await pipeline.close()
+
+
+async def test_pipeline_resynchronises() -> None:
+    """Responses matching nobody trigger a resync, outstanding commands are sent again."""
+    reader = asyncio.StreamReader()
+    writer = FakeWriter()
+    pipeline = CommandPipeline(reader, writer, window=2)  # type: ignore[arg-type]
+    pipeline.start()
+
+    power = asyncio.create_task(pipeline.execute(b"ka 01 FF\r", "a", 1))
+    volume = asyncio.create_task(pipeline.execute(b"kf 01 FF\r", "f", 1))
+    await asyncio.sleep(0)
+    assert pipeline.generation == 0
+
+    # Duplicated response for an earlier command, everything after it is stale
+    reader.feed_data(b"b 01 OK90xf 01 OK10x")
+    await asyncio.sleep(0)
+    assert pipeline.generation == 1
+    assert writer.written == b"ka 01 FF\rkf 01 FF\r"
+
+    # Commands are sent again once the line is quiet
+    await asyncio.sleep(0.3)
+    assert writer.written == b"ka 01 FF\rkf 01 FF\r" * 2
+    reader.feed_data(b"a 01 OK01xf 01 OK10x")
+    assert await power == b"a 01 OK01"
+    assert await volume == b"f 01 OK10"
+
+    assert pipeline.counters == PipelineCounters(unmatched_responses=1, stale_frames=1, resyncs=1, retries=2)
+
+
+async def test_pipeline_resynchronises_after_timeout() -> None:
+    """A late response for a timed out command is not taken for the next command."""
+    reader = asyncio.StreamReader()
+    writer = FakeWriter()
+    pipeline = CommandPipeline(reader, writer, window=1)  # type: ignore[arg-type]
+    pipeline.start()
+
+    with pytest.raises(TimeoutError):
+        await pipeline.execute(b"ka 01 FF\r", "a", 0.05)
+    power = asyncio.create_task(pipeline.execute(b"ka 01 01\r", "a", 1))
+    await asyncio.sleep(0.1)
+    reader.feed_data(b"a 01 OK01x")
+
+    await asyncio.sleep(0.3)
+    reader.feed_data(b"a 01 OK00x")
+    assert await power == b"a 01 OK00"
+    assert pipeline.counters.stale_frames == 1
+
+    await pipeline.close()
+
+
+async def test_pipeline_backs_off_on_estimated_timeouts_only() -> None:
+    """A timeout the caller chose, like a boot probe, does not grow the estimated timeout."""
+    reader = asyncio.StreamReader()
+    writer = FakeWriter()
+    pipeline = CommandPipeline(reader, writer, rtt=RttEstimator(minimum=0.05, maximum=5))  # type: ignore[arg-type]
+    pipeline.start()
+    power = asyncio.create_task(pipeline.execute(b"ka 01 FF\r", "a", 1))
+    await asyncio.sleep(0.01)
+    reader.feed_data(b"a 01 OK01x")
+    await power
+    timeout = pipeline.rtt.timeout
+
+    with pytest.raises(TimeoutError):
+        await pipeline.execute(b"ka 01 FF\r", "a", 0.05)
+    assert pipeline.rtt.timeout == timeout
+
+    await asyncio.sleep(0.3)
+    with pytest.raises(TimeoutError):
+        await pipeline.execute(b"ka 01 FF\r", "a")
+    assert pipeline.rtt.timeout > timeout
+
+    await pipeline.close()
+
+
+async def test_pipeline_routes_by_set_id() -> None:
+    """Responses go to the command for the TV that responded, broadcasts match any TV."""
+    reader = asyncio.StreamReader()
+    writer = FakeWriter()
+    pipeline = CommandPipeline(reader, writer, window=3)  # type: ignore[arg-type]
+    pipeline.start()
+
+    tv1 = asyncio.create_task(pipeline.execute(b"ka 01 FF\r", "a", 1))
+    tv2 = asyncio.create_task(pipeline.execute(b"ka 02 FF\r", "a", 1))
+    anyone = asyncio.create_task(pipeline.execute(b"kf 00 FF\r", "f", 1))
+    await asyncio.sleep(0.01)
+
+    reader.feed_data(b"a 02 OK00xa 01 OK01xf 03 OK10x")
+    assert await tv1 == b"a 01 OK01"
+    assert await tv2 == b"a 02 OK00"
+    assert await anyone == b"f 03 OK10"
+    assert pipeline.counters.resyncs == 0
+
+    await pipeline.close()
+
+
+async def test_pipeline_execute_many() -> None:
+    """One frame collects the responses of multiple TVs, missing ones are None."""
+    reader = asyncio.StreamReader()
+    writer = FakeWriter()
+    pipeline = CommandPipeline(reader, writer, window=1)  # type: ignore[arg-type]
+    pipeline.start()
+
+    broadcast = asyncio.create_task(pipeline.execute_many(b"ka 00 00\r", "a", [1, 2], 1))
+    await asyncio.sleep(0.01)
+    reader.feed_data(b"a 02 OK00xa 01 OK00x")
+    assert await broadcast == {1: b"a 01 OK00", 2: b"a 02 OK00"}
+    assert writer.written == b"ka 00 00\r"
+
+    broadcast = asyncio.create_task(pipeline.execute_many(b"ka 00 00\r", "a", [1, 2], 0.1))
+    await asyncio.sleep(0.01)
+    reader.feed_data(b"a 01 OK00x")
+    assert await broadcast == {1: b"a 01 OK00", 2: None}
+    assert pipeline.counters.resyncs == 1
+
+    await pipeline.close()
+
+
+async def test_pipeline_priority() -> None:
+    """Interactive commands are sent before waiting background commands, stale ones are dropped."""
+    reader = asyncio.StreamReader()
+    writer = FakeWriter()
+    pipeline = CommandPipeline(reader, writer, window=1)  # type: ignore[arg-type]
+    pipeline.start()
+
+    power = asyncio.create_task(pipeline.execute(b"ka 01 FF\r", "a", 1, Priority.BACKGROUND))
+    await asyncio.sleep(0)
+    stale = asyncio.create_task(pipeline.execute(b"kf 01 FF\r", "f", 1, Priority.BACKGROUND, max_wait=0.01))
+    volume = asyncio.create_task(pipeline.execute(b"ke 01 FF\r", "e", 1, Priority.BACKGROUND))
+    mute = asyncio.create_task(pipeline.execute(b"ke 01 01\r", "e", 1, Priority.INTERACTIVE))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(CommandDropped):
+        await stale
+
+    reader.feed_data(b"a 01 OK01x")
+    assert await power == b"a 01 OK01"
+    await asyncio.sleep(0)
+    assert writer.written == b"ka 01 FF\rke 01 01\r"
+
+    reader.feed_data(b"e 01 OK01x")
+    assert await mute == b"e 01 OK01"
+    await asyncio.sleep(0)
+    reader.feed_data(b"e 01 OK00x")
+    assert await volume == b"e 01 OK00"
+
+    assert pipeline.queue_wait[Priority.BACKGROUND].dropped == 1
+    assert pipeline.queue_wait[Priority.BACKGROUND].count == 2
+    assert pipeline.queue_wait[Priority.INTERACTIVE].count == 1
+
+    await pipeline.close()
+
+
+async def test_pipeline_connection_lost() -> None:
+    """Outstanding commands fail with a ConnectionError when the connection is lost."""
+    reader = asyncio.StreamReader()
+    lost = asyncio.Event()
+
+    async def on_connection_lost() -> None:
+        lost.set()
+
+    pipeline = CommandPipeline(reader, FakeWriter(), on_connection_lost=on_connection_lost)  # type: ignore[arg-type]
+    pipeline.start()
+
+    power = asyncio.create_task(pipeline.execute(b"ka 01 FF\r", "a", 1))
+    await asyncio.sleep(0)
+    reader.feed_eof()
+
+    with pytest.raises(ConnectionError):
+        await power
+    assert lost.is_set()
+
+
+async def test_connection_lost_during_command(emulator) -> None:
+    """Commands in flight and waiting to be sent fail with a ConnectionError when the connection drops."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1) as tv:
+        await tv.connect()
+        state.response_delay = 0.3
+        in_flight = asyncio.create_task(tv.get_volume())
+        waiting = asyncio.create_task(tv.get_mute())
+        await asyncio.sleep(0.05)
+        for writer in list(state.active_clients):
+            writer.close()
+
+        with pytest.raises(ConnectionError):
+            await in_flight
+        with pytest.raises(ConnectionError):
+            await waiting
+
+
+async def test_snapshot(emulator) -> None:
+    """Snapshot reads the requested fields and reports status per field."""
+    state, serial_url = emulator
+    state.volume = 0x20
+    state.input_source = 0x90
+
+    async with LgTv(serial_url, 1, window=3) as tv:
+        await tv.connect()
+
+        snapshot = await tv.snapshot(["power_on", "volume", "input"])
+        assert snapshot.power_on == FieldResult(FieldStatus.OK, True)
+        assert snapshot.volume == FieldResult(FieldStatus.OK, 0x20)
+        assert snapshot.input == FieldResult(FieldStatus.OK, Input.HDMI1)
+        assert snapshot.mute is None
+
+        # TV only accepts the power command when off
+        state.power = False
+        snapshot = await tv.snapshot(["power_on", "volume"])
+        assert snapshot.value("power_on") is False
+        assert snapshot.volume == FieldResult(FieldStatus.NG)
+
+
+async def test_tvs_share_bus(emulator) -> None:
+    """TVs on the same serial url share one connection, which closes with the last TV."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1) as tv1, LgTv(serial_url, 0) as tv_all:
+        await tv1.connect()
+        await tv_all.connect()
+        assert state.clients_connected == 1
+
+        assert await tv1.get_volume() == 0x10
+        assert await tv_all.get_volume() == 0x10
+
+        await tv1.close()
+        assert await tv_all.get_power_on() is True
+
+    await asyncio.sleep(0.01)
+    assert state.clients_connected == 0
+
+
+async def test_reconnect(emulator) -> None:
+    """A lost connection gets reopened in place."""
+    state, serial_url = emulator
+    events = []
+
+    async def on_disconnect() -> None:
+        events.append("disconnect")
+
+    async def on_reconnect() -> None:
+        events.append("reconnect")
+
+    async with LgTv(serial_url, 1, reconnect_delay_min=0.05) as tv:
+        await tv.connect(on_disconnect, on_reconnect, reconnect=True)
+
+        for writer in list(state.active_clients):
+            writer.close()
+        await asyncio.sleep(0.01)
+        assert events == ["disconnect"]
+        assert not tv.connected
+        with pytest.raises(ConnectionError):
+            await tv.get_volume()
+
+        for _ in range(50):
+            if tv.connected:
+                break
+            await asyncio.sleep(0.01)
+        assert events == ["disconnect", "reconnect"]
+        assert await tv.get_volume() == state.volume
+        stats = tv.connection_stats
+        assert (stats.attempts, stats.reconnects, stats.disconnected_at) == (1, 1, None)
+        assert stats.downtime > 0
+
+    assert not tv.connected
+    assert events == ["disconnect", "reconnect"]
+
+
+async def test_reconnect_keeps_bus(emulator) -> None:
+    """Failed reconnect attempts do not orphan the bus of the serial url."""
+    state, serial_url = emulator
+    opened = 0
+
+    async def open_connection(**kwargs):
+        nonlocal opened
+        opened += 1
+        if opened == 2:
+            raise OSError("Gateway still down")
+        return await serialx.open_serial_connection(**kwargs)
+
+    async with LgTv(serial_url, 1, reconnect_delay_min=0.05, open_connection=open_connection) as tv:
+        await tv.connect(reconnect=True)
+        bus = SerialBus.get(serial_url)
+
+        for writer in list(state.active_clients):
+            writer.close()
+        await asyncio.sleep(0.01)
+        assert not tv.connected
+        for _ in range(100):
+            if tv.connected:
+                break
+            await asyncio.sleep(0.01)
+        assert tv.connected
+        assert tv.connection_stats.attempts == 2
+        assert SerialBus.get(serial_url) is bus
+        assert bus.pipeline is not None
+
+
+async def test_reconnect_survives_invalid_response(emulator, monkeypatch) -> None:
+    """A garbled response to the reconnect probe is a failed attempt, not the end of reconnecting."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1, reconnect_delay_min=0.05) as tv:
+        await tv.connect(reconnect=True)
+
+        def garbled(frame):
+            monkeypatch.undo()
+            raise ValueError("Invalid hex value at 7")
+
+        monkeypatch.setattr(lgtv_api, "parse_response", garbled)
+        for writer in list(state.active_clients):
+            writer.close()
+        await asyncio.sleep(0.01)
+        assert not tv.connected
+        for _ in range(100):
+            if tv.connected:
+                break
+            await asyncio.sleep(0.01)
+        assert tv.connected
+        assert tv.connection_stats.attempts == 2
+
+
+async def test_command_stats(emulator) -> None:
+    """What happens on the wire is tracked per command."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1) as tv:
+        await tv.connect()
+        await tv.get_volume()
+        state.response_delay = 0.3
+        assert await tv.get_volume(timeout=0.1) is None
+        state.response_delay = 0
+        await asyncio.sleep(0.5)
+        await tv.set_power_on(False)
+        assert await tv.get_volume() is None
+
+        stats = tv.stats()
+        volume = stats.commands[("k", "f")]
+        assert isinstance(volume, CommandStats)
+        assert (volume.sent, volume.responses, volume.timeouts, volume.ng) == (3, 2, 1, 1)
+        assert volume.bytes_out == 3 * len(b"kf 01 FF\r")
+        assert volume.bytes_in == len(b"f 01 OK10x") + len(b"f 01 NG00x")
+        assert sum(volume.latency_histogram) == 2
+        assert volume.average_latency is not None
+        assert stats.commands[("k", "a")].sent == 2
+        assert stats.connection.reconnects == 0
+
+
+async def test_capture(emulator) -> None:
+    """Everything on the wire is captured in a bounded ring buffer."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1) as tv:
+        await tv.connect()
+        assert tv.capture is None
+
+        capture = tv.start_capture(max_bytes=30)
+        await tv.get_volume()
+        await tv.get_mute()
+        # The oldest record got dropped to stay within max_bytes
+        assert [(record.sent, record.data) for record in capture.records] == [
+            (False, b"f 01 OK10x"),
+            (True, b"ke 01 FF\r"),
+            (False, b"e 01 OK01x"),
+        ]
+        assert capture.dropped == 1
+
+        lines = capture.to_jsonl().splitlines()
+        assert [CaptureRecord.from_json(json.loads(line)) for line in lines] == capture.records
+        assert json.loads(lines[-1])["direction"] == "rx"
+
+        assert tv.stop_capture() is capture
+        await tv.get_volume()
+        assert tv.capture is None
+        assert capture.records[-1].data == b"e 01 OK01x"
+
+
+def test_capture_record_counts_junk() -> None:
+    record = CaptureRecord(1.0, False, b"\xff\xfff 01 OK10x")
+    assert record.to_json() == {
+        "time": 1.0,
+        "direction": "rx",
+        "data": "ffff66203031204f4b313078",
+        "text": "\\xff\\xfff 01 OK10x",
+        "junk": 2,
+    }
+
+
+# Response to the power query of `LgTv.connect()`
+CONNECT_RECORDS = [CaptureRecord(0.0, True, b"ka 01 FF\r"), CaptureRecord(0.0, False, b"a 01 OK01x")]
+
+
+async def test_replay_capture(emulator) -> None:
+    """A captured session can be replayed without the TV."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1) as tv:
+        await tv.connect()
+        capture = tv.start_capture()
+        values = (await tv.get_volume(), await tv.get_mute(), await tv.get_input())
+
+    replay = ReplayTransport.from_jsonl(
+        "".join(json.dumps(record.to_json()) + "\n" for record in CONNECT_RECORDS) + capture.to_jsonl(),
+        realtime=False,
+    )
+    async with LgTv("replay://capture", 1, open_connection=replay.open_connection) as tv:
+        await tv.connect()
+        assert (await tv.get_volume(), await tv.get_mute(), await tv.get_input()) == values
+    assert replay.mismatches == 0
+    assert replay.done
+
+
+async def test_replay_field_traffic() -> None:
+    """Junk, split chunks and duplicated responses are replayed, optionally with the original timing."""
+    records = CONNECT_RECORDS + [
+        CaptureRecord(1.0, True, b"kf 01 FF\r"),
+        CaptureRecord(1.1, False, b"\xff\xfff 01 O"),
+        CaptureRecord(1.2, False, b"K10x"),
+        CaptureRecord(1.2, False, b"f 01 OK10x"),
+        CaptureRecord(2.0, True, b"ke 01 FF\r"),
+        CaptureRecord(2.1, False, b"e 01 OK01x"),
+    ]
+
+    for realtime in (False, True):
+        replay = ReplayTransport(records, realtime=realtime)
+        async with LgTv("replay://field", 1, open_connection=replay.open_connection) as tv:
+            await tv.connect()
+            start = asyncio.get_running_loop().time()
+            assert await tv.get_volume() == 0x10
+            assert (asyncio.get_running_loop().time() - start >= 0.2) is realtime
+            # The duplicate gets discarded by resynchronising
+            await asyncio.sleep(RESYNC_QUIET_TIME + 0.05)
+            assert tv.counters.unmatched_responses == 1
+            assert await tv.get_mute() is False
+            assert tv.stats().junk_bytes == 2
+        assert replay.done
+
+
+async def test_tv_group(chain) -> None:
+    """TVs on one bus get a single broadcast frame, confirmation is optional."""
+    states, serial_url, received = chain
+
+    async with LgTv(serial_url, 1) as tv1, LgTv(serial_url, 2) as tv2:
+        await tv1.connect()
+        await tv2.connect()
+        group = TvGroup([tv1, tv2])
+        received.clear()
+
+        results = await group.set_input(Input.HDMI2)
+        assert {tv.set_id: response.data0 for tv, response in results.items()} == {1: 0x91, 2: 0x91}
+        assert received == [b"xb 00 91"]
+        # The broadcast shows up in the statistics of every TV
+        for tv in (tv1, tv2):
+            stats = tv.stats().commands[("x", "b")]
+            assert (stats.sent, stats.responses, stats.timeouts) == (1, 1, 0)
+            assert stats.bytes_out == len(b"xb 00 91\r")
+            assert stats.bytes_in == len(b"b 01 OK91x")
+
+        # Group with a part of the TVs on the bus sends a frame per TV
+        assert list(await TvGroup([tv2]).set_input(Input.HDMI1)) == [tv2]
+        assert received[-1] == b"xb 02 90"
+        assert (states[1].input_source, states[2].input_source) == (0x91, 0x90)
+
+        results = await group.set_power_on(False, confirm=False)
+        assert results == {tv1: None, tv2: None}
+        assert await tv1.get_power_on() is False
+        assert await tv2.get_power_on() is False
+        assert tv1.counters.resyncs == 0
+
+
+async def test_power_on_waits_for_boot(emulator, monkeypatch) -> None:
+    """Commands wait for a booting TV instead of timing out."""
+    state, serial_url = emulator
+    monkeypatch.setattr(lgtv_emulator, "BOOT_DELAY", 0.5)
+
+    async with LgTv(serial_url, 1) as tv:
+        await tv.connect()
+        assert tv.power_state is PowerState.ON
+
+        await tv.set_power_on(False)
+        assert tv.power_state is PowerState.OFF
+
+        await tv.set_power_on(True)
+        assert tv.power_state is PowerState.BOOTING
+        start = asyncio.get_running_loop().time()
+        assert await tv.get_volume() == state.volume
+        assert asyncio.get_running_loop().time() - start < 1.5
+        assert tv.power_state is PowerState.ON
+        assert await tv.wait_until_ready(0) is True
+        # Probing is not counted as timeouts
+        assert tv.stats().commands[("k", "a")].sent > 2
+        assert tv.stats().commands[("k", "a")].timeouts == 0
+
+
+async def test_boot_probe_survives_invalid_response() -> None:
+    """A garbled response to a boot probe does not leave the TV booting forever."""
+    replay = ReplayTransport(
+        [
+            CaptureRecord(0.0, True, b"ka 01 FF\r"),
+            CaptureRecord(0.0, False, b"a 01 OK00x"),
+            CaptureRecord(1.0, True, b"ka 01 01\r"),
+            CaptureRecord(1.0, False, b"a 01 OK01x"),
+            CaptureRecord(1.1, True, b"ka 01 FF\r"),
+            CaptureRecord(1.1, False, b"a 01 OKZ1x"),
+            CaptureRecord(2.0, True, b"ka 01 FF\r"),
+            CaptureRecord(2.0, False, b"a 01 OK01x"),
+            CaptureRecord(3.0, True, b"kf 01 FF\r"),
+            CaptureRecord(3.0, False, b"f 01 OK10x"),
+        ],
+        realtime=False,
+    )
+    async with LgTv("replay://boot", 1, open_connection=replay.open_connection) as tv:
+        await tv.connect()
+        assert tv.power_state is PowerState.OFF
+
+        await tv.set_power_on(True)
+        assert tv.power_state is PowerState.BOOTING
+        async with asyncio.timeout(2):
+            assert await tv.get_volume() == 0x10
+        assert tv.power_state is PowerState.ON
+    assert replay.done
+
+
+async def test_late_responses_are_discarded(emulator) -> None:
+    """Late and partial responses are never taken as response for the next command."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1) as tv:
+        await tv.connect()
+
+        # Times out halfway the response
+        state.response_delay = 0.3
+        assert await tv.get_volume(timeout=0.1) is None
+        state.response_delay = 0
+        state.volume = 0x20
+        assert await tv.get_volume() == 0x20
+
+        # Caller is cancelled halfway the response
+        state.response_delay = 0.1
+        task = asyncio.create_task(tv.get_volume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        state.volume = 0x30
+        state.response_delay = 0
+        # Still in flight, so merged with the cancelled read
+        assert await tv.get_volume() == 0x20
+        assert await tv.get_volume() == 0x30
+
+        assert tv.counters.unmatched_responses == 0
+
+
+async def test_read_cache(emulator) -> None:
+    """Reads within the TTL or max_age come from the cache, setters update it."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1, cache_ttl={"volume": 60}) as tv:
+        await tv.connect()
+
+        assert await tv.get_volume() == 0x10
+        state.volume = 0x20
+        assert await tv.get_volume() == 0x10
+        assert await tv.get_volume(max_age=0) == 0x20
+
+        await tv.set_volume(0x30)
+        state.volume = 0x31
+        assert await tv.get_volume() == 0x30
+
+        # Only with max_age for fields without TTL
+        assert await tv.get_mute() is False
+        state.volume_mute = True
+        assert await tv.get_mute(max_age=60) is False
+        assert await tv.get_mute() is True
+
+        # Power changes invalidate everything
+        await tv.set_power_on(False)
+        assert await tv.get_power_on(max_age=60) is False
+        assert await tv.get_volume() is None
+
+        snapshot = await tv.snapshot(["power_on", "mute"], max_age=60)
+        assert snapshot.power_on == FieldResult(FieldStatus.OK, False)
+        assert snapshot.mute == FieldResult(FieldStatus.NG)
+
+        assert (tv.cache_hits, tv.cache_misses) == (5, 4)
+
+
+async def test_reads_are_merged(emulator) -> None:
+    """Identical queries in flight at the same time send only one frame."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1, window=3) as tv:
+        await tv.connect()
+        received = state.total_commands_received
+
+        first = asyncio.create_task(tv.get_power_on())
+        results = await asyncio.gather(
+            tv.get_power_on(),
+            tv.get_input(),
+            tv.snapshot(["power_on", "input"]),
+        )
+        assert results[:2] == [True, Input.DTV]
+        assert results[2].power_on == FieldResult(FieldStatus.OK, True)
+        assert await first is True
+        assert state.total_commands_received - received == 2
+        assert tv.merged_reads == 3
+
+        # The other callers still get the response when the first one is cancelled
+        first = asyncio.create_task(tv.get_volume())
+        second = asyncio.create_task(tv.get_volume())
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 0x10
+
+
+async def test_redundant_writes_are_skipped(emulator) -> None:
+    """Setters skip values the TV recently reported unless forced."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1, redundant_write_max_age=60) as tv:
+        await tv.connect()
+        assert await tv.get_input() == Input.DTV
+        received = state.total_commands_received
+
+        await tv.set_input(Input.DTV)
+        await tv.set_volume(0x10)  # Not known yet
+        await tv.set_volume(0x10)
+        assert state.total_commands_received - received == 1
+        assert tv.skipped_writes == 2
+
+        # E.g. changed with the IR remote
+        state.input_source = 0x90
+        await tv.set_input(Input.DTV, force=True)
+        assert state.input_source == 0x00
+
+
+@pytest.mark.parametrize("chain", [(1, 10)], indirect=True)
+async def test_shared_bus_with_hex_set_id(chain) -> None:
+    """TVs with a set ID of 10 or higher get their responses on a shared line."""
+    states, serial_url, received = chain
+    states[10].volume = 0x20
+
+    async with LgTv(serial_url, 1) as tv1, LgTv(serial_url, 10) as tv10:
+        await tv1.connect()
+        await tv10.connect()
+
+        assert await tv10.get_volume() == 0x20
+        assert received[-1] == b"kf 0A FF"
+        assert await tv1.get_volume() == 0x10
+
+        results = await TvGroup([tv1, tv10]).set_input(Input.HDMI2)
+        assert {tv.set_id: response.data0 for tv, response in results.items()} == {1: 0x91, 10: 0x91}
+        assert tv10.counters.unmatched_responses == 0
+
+
+async def test_group_commands_update_cache(chain) -> None:
+    """Writes are not skipped based on values a group command changed."""
+    states, serial_url, received = chain
+
+    async with LgTv(serial_url, 1, redundant_write_max_age=10) as tv1, LgTv(serial_url, 2) as tv2:
+        await tv1.connect()
+        await tv2.connect()
+        group = TvGroup([tv1, tv2])
+
+        assert await tv1.get_input() == Input.DTV
+        await group.set_input(Input.HDMI2)
+        await tv1.set_input(Input.DTV)
+        assert states[1].input_source == Input.DTV
+
+        # The response to the group command is as good as reading it
+        await group.set_input(Input.HDMI2)
+        await tv1.set_input(Input.HDMI2)
+        assert tv1.skipped_writes == 1
+
+        await group.set_input(Input.HDMI1, confirm=False)
+        await tv1.set_input(Input.HDMI2)
+        assert tv1.skipped_writes == 1
+        assert states[1].input_source == Input.HDMI2
+
+
+async def test_setters_coalesce(emulator) -> None:
+    """Only the first and the newest of rapid volume changes get written."""
+    state, serial_url = emulator
+
+    async with LgTv(serial_url, 1) as tv:
+        await tv.connect()
+        commands_before = state.total_commands_received
+
+        await asyncio.gather(*(tv.set_volume(volume) for volume in range(10, 30)))
+
+        assert state.volume == 29
+        assert state.total_commands_received - commands_before == 2
+        assert tv.coalesced_writes == 18